@@ -0,0 +1,119 @@
+# forensic_analyzer/analyze.py
+from __future__ import annotations
+import hashlib
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+from .hashing import CHUNK_SIZE_DEFAULT, compute_file_hashes, hash_columns, hash_open_file
+from .signature import HEAD_SIZE, fill_signature_columns, probe_file_type, probe_from_bytes
+
+
+# 공개 API. 해시와 시그니처를 둘 다 구할 때 add_hashes_to_rows + add_signature_to_rows 대신 호출.
+
+def analyze_files(
+    rows: List[Dict[str, Union[str, int, float, None]]],
+    *,
+    compute_hashes: bool = True,
+    compute_signature: bool = True,
+    algorithms: Tuple[str, ...] = ("sha256",),
+    chunk_size: int = CHUNK_SIZE_DEFAULT,
+    compute_md5: bool = False,
+    prefer_magic: bool = True,
+    disk_ext_field: str = "ext_on_disk",
+    sig_prefix: str = "sig_",
+    missing_as: str = "",
+    workers: Optional[int] = None,
+) -> List[Dict[str, Union[str, int, float, None]]]:
+    """
+    해시 열과 시그니처 열을 파일당 open 한 번으로 함께 계산해 rows에 추가.
+    - 추가되는 열/값은 add_hashes_to_rows 후 add_signature_to_rows를 부른 것과 같음
+    - 파일 앞 HEAD_SIZE(16KB)를 읽어 시그니처 판정에 쓰고, 같은 핸들로 hash_open_file(head=...)에 넘겨
+      나머지만 이어서 읽음 → 앞부분 read가 한 번으로 줄고, 두 단계 사이에 페이지 캐시가 밀려나지 않음
+      (해시와 시그니처가 같은 열린 파일 기준이라 중간에 파일이 교체돼도 서로 다른 파일 내용이 섞이지 않음)
+    - 한쪽만 필요하면 해당 단계만 계산 (그 경우는 기존 함수와 동일한 경로)
+    - workers: 스레드 수. None이면 ThreadPoolExecutor 기본값(add_hashes_to_rows 스레드 풀 기본값과 같은 min(32, 코어 수 + 4))
+    - dedup_only, 프로세스 풀이 필요하면 add_hashes_to_rows를 따로 사용
+    """
+    algorithms = hash_columns(algorithms, compute_md5)
+    if compute_hashes:
+        for algo in algorithms:
+            hashlib.new(algo)  # 지원하지 않는 알고리즘 명이면 여기서 ValueError
+    targets = []
+    for row in rows:
+        if row.get("path"):
+            targets.append(row)
+            continue
+        if compute_hashes:
+            for algo in algorithms:
+                row[algo] = missing_as
+        if compute_signature:
+            row[f"{sig_prefix}mime"] = missing_as
+            row[f"{sig_prefix}ext"] = missing_as
+            row[f"{sig_prefix}desc"] = missing_as
+            row["ext_mismatch"] = False
+            row[disk_ext_field] = missing_as
+
+    if not targets:
+        return rows
+
+    def work(row):
+        return _analyze_file(
+            str(row["path"]), algorithms, chunk_size,
+            compute_hashes=compute_hashes,
+            compute_signature=compute_signature,
+            prefer_magic=prefer_magic,
+        )
+
+    with ThreadPoolExecutor(max_workers=None if workers is None else max(1, workers)) as ex:
+        for row, (hashes, signature) in zip(targets, ex.map(work, targets)):
+            if compute_hashes:
+                for algo in algorithms:
+                    row[algo] = missing_as if hashes is None else hashes.get(algo, missing_as)
+            if compute_signature:
+                fill_signature_columns(
+                    row, str(row["path"]), signature,
+                    disk_ext_field=disk_ext_field, sig_prefix=sig_prefix, missing_as=missing_as,
+                )
+    return rows
+
+
+# 내부 함수
+
+def _analyze_file(
+    path: str,
+    algorithms: Tuple[str, ...],
+    chunk_size: int,
+    *,
+    compute_hashes: bool,
+    compute_signature: bool,
+    prefer_magic: bool,
+) -> Tuple[Optional[Dict[str, str]], Optional[Dict[str, str]]]:
+    """
+    파일 하나의 (해시 dict 또는 None, 시그니처 dict 또는 None) 반환.
+    - None 규칙은 compute_file_hashes / probe_file_type과 같음
+    """
+    if not compute_signature:
+        return compute_file_hashes(path, algorithms, chunk_size=chunk_size), None
+    if not compute_hashes:
+        return None, probe_file_type(path, prefer_magic=prefer_magic)
+
+    try:
+        regular = stat.S_ISREG(os.stat(path).st_mode)
+    except (OSError, PermissionError):
+        regular = False
+    if not regular:
+        # probe_file_type과 같게 시그니처 없음. 해시는 기존 함수 규칙 그대로
+        return compute_file_hashes(path, algorithms, chunk_size=chunk_size), None
+
+    # probe_file_type과 달리 libmagic 모드가 아니어도 앞부분을 읽음 (어차피 해시에 필요한 바이트)
+    head: Optional[bytes] = None
+    hashes: Optional[Dict[str, str]] = None
+    try:
+        with open(path, "rb") as f:
+            head = f.read(HEAD_SIZE)
+            hashes = hash_open_file(f, algorithms, chunk_size=chunk_size, head=head)
+    except (PermissionError, FileNotFoundError, OSError):
+        hashes = None
+    return hashes, probe_from_bytes(path, head, prefer_magic=prefer_magic)
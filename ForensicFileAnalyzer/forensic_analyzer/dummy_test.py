@@ -44,10 +44,13 @@ def jpeg_like_corrupted() -> bytes:
     # JPEG 마커 시작만 두고 뒤를 깨뜨려 손상파일처럼 만듦
     return b"\xff\xd8\xff\xe0" + b"THIS_IS_CORRUPTED_NOT_A_REAL_JPEG"
 
-def big_file_chunks(total_mb=10, chunk_kb=256):
-    chunks = (total_mb * 1024) // chunk_kb
-    for _ in range(int(chunks)):
-        yield os.urandom(chunk_kb * 1024)
+# 픽스처 바이트는 매번 만들 필요 없이 모듈 로드 시 한 번만
+PNG_1X1 = png_bytes()
+JPEG_CORRUPTED = jpeg_like_corrupted()
+
+def big_file_bytes(total_mb=10) -> bytes:
+    # 랜덤 바이트를 한 번에 만들어 write 한 번으로 기록 (청크별 write 호출 대신)
+    return os.urandom(total_mb * 1024 * 1024)
 
 def make_zip(zip_path: pathlib.Path, members: dict[str, bytes]):
     with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
@@ -79,20 +82,16 @@ def main():
     write(bins / "empty.bin", b"")
 
     # 대형 파일 (~10MB)
-    big = bins / "big_random_10MB.bin"
-    big.parent.mkdir(parents=True, exist_ok=True)
-    with open(big, "wb") as f:
-        for chunk in big_file_chunks(total_mb=10, chunk_kb=256):
-            f.write(chunk)
+    write(bins / "big_random_10MB.bin", big_file_bytes(total_mb=10))
 
     # 시그니처/확장자 불일치
     # PNG 시그니처이지만 확장자를 .jpg 로
-    write(images / "mismatch_signature.jpg", png_bytes())
+    write(images / "mismatch_signature.jpg", PNG_1X1)
     # 진짜 PNG
-    write(images / "true_image.png", png_bytes())
+    write(images / "true_image.png", PNG_1X1)
 
     # 손상 이미지 (JPEG처럼 보이긴 하는데 깨진다ㅇ)
-    write(images / "corrupted_photo.jpg", jpeg_like_corrupted())
+    write(images / "corrupted_photo.jpg", JPEG_CORRUPTED)
 
     # 일반 텍스트/CSV/JSON/로그
     write_text(docs / "notes.txt", "hello\nthis is a note\n")
@@ -1,6 +1,8 @@
 
 from pathlib import Path
-import csv, datetime, tempfile, os
+import csv, datetime, io, tempfile, os
+
+_CSV_BUFFER_SIZE = 8 * 1024 * 1024  # 8MB
 
 def ensure_dir(path: Path) -> Path:
     path.mkdir(parents=True, exist_ok=True)
@@ -10,14 +12,21 @@ def write_csv(rows, out_path: Path, fieldnames: list[str]):
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
     # atomic write
+    # 바이너리 임시 파일(큰 버퍼) 위에 TextIOWrapper 하나만 얹어 인코딩 → csv 모듈이 C 루프로 곧장 기록
+    # os.replace 전에 fsync 해서, 중간에 전원이 나가도 빈/잘린 파일로 교체되지 않게 함
 
-    with tempfile.NamedTemporaryFile("w", delete=False, encoding="utf-8-sig", newline="",
-                                    dir=out_path.parent) as tf:
-        w = csv.DictWriter(tf, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow({k: r.get(k, "") for k in fieldnames})
-        tmp_name = tf.name
+    with tempfile.NamedTemporaryFile("wb", delete=False, buffering=_CSV_BUFFER_SIZE,
+                                    dir=out_path.parent) as tf_raw:
+        tf = io.TextIOWrapper(tf_raw.file, encoding="utf-8-sig", newline="",
+                              write_through=False, line_buffering=False)
+        w = csv.writer(tf)
+        w.writerow(fieldnames)
+        w.writerows((r.get(k, "") for k in fieldnames) for r in rows)
+        tf.flush()
+        tf.detach()  # 닫기는 tf_raw 쪽에서
+        tf_raw.flush()
+        os.fsync(tf_raw.fileno())
+        tmp_name = tf_raw.name
     os.replace(tmp_name, out_path)  # atomic move
 
 def make_outpath(tool: str, out_dir: Path, label: str | None, suffix="csv") -> Path:
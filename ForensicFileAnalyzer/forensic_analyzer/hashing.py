@@ -1,69 +1,299 @@
 # forensic_analyzer/hashing.py
 from __future__ import annotations
 import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple, Union
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
 
-_CHUNK_SIZE_DEFAULT = 1024 * 1024  # 1MB
+# xxhash가 있으면 중복 후보 지문(fingerprint)에 사용, 없으면 hashlib.blake2b로 대체
+try:
+    import xxhash  # type: ignore
+    _HAS_XXHASH = True
+except Exception:
+    _HAS_XXHASH = False
+
+CHUNK_SIZE_DEFAULT = 4 * 1024 * 1024  # 4MB
+
+# Python 3.11+ : hashlib.file_digest가 읽기 루프를 내부에서 처리
+_HAS_FILE_DIGEST = sys.version_info >= (3, 11)
+
+# 작은 파일은 여러 개를 한 작업(batch)으로 묶어 풀에 넘김 (작업당 스케줄링/피클링 오버헤드 절감)
+_BATCH_MAX_BYTES = 8 * 1024 * 1024  # 8MB
+_BATCH_MAX_FILES = 64
+
+# 중복 후보 지문: 파일 앞/뒤 64KB만 읽음
+_FINGERPRINT_SPAN = 64 * 1024
+
+# 해시 후 페이지 캐시를 비울 최소 파일 크기. 작은 파일은 다음 단계에서 다시 읽을 가능성이 커서 그대로 둠
+_DROP_CACHE_MIN_BYTES = 8 * 1024 * 1024  # 8MB
+
+# 스레드 풀 기본 작업 수. 해시 작업은 대부분 read 대기이므로 코어 수보다 많이 띄워
+# 디스크(NVMe) 큐에 동시에 여러 요청이 걸리게 함 (concurrent.futures 기본값과 같은 공식)
+_IO_WORKERS_DEFAULT = min(32, (os.cpu_count() or 1) + 4)
 
 def compute_file_hashes(
     path: Union[str, Path],
-    algorithms: Tuple[str, ...] = ("md5", "sha256"),
+    algorithms: Tuple[str, ...] = ("sha256",),
     *,
-    chunk_size: int = _CHUNK_SIZE_DEFAULT,
+    chunk_size: int = CHUNK_SIZE_DEFAULT,
+    compute_md5: bool = False,
 ) -> Optional[Dict[str, str]]:
     """
     파일을 스트리밍으로 읽어 지정한 알고리즘 해시를 계산.
-    - 성공 시 {"md5": "...", "sha256": "..."} 반환
+    - 성공 시 {"sha256": "..."} 반환 (compute_md5=True면 "md5"도 포함)
+    - 기본은 SHA-256만 계산. Ice Lake/Zen2 이후 CPU에서는 OpenSSL이 SHA-NI 명령어를 써서
+      SHA-256 처리량이 MD5와 비슷하므로, MD5를 빼면 바이트당 작업량이 대략 절반이 됨
+    - compute_md5: 구형 도구/보고서와 맞춰야 할 때만 MD5 추가
     - 접근 실패/읽기 실패 시 None
+    - 알고리즘 1개 → hashlib.file_digest (3.11+)
+    - 그 외(알고리즘 여러 개/구버전) → chunk_size 버퍼 하나를 재사용하는 readinto 루프, 같은 버퍼를 모든 해셔에 넘김
+      (청크마다 bytes를 새로 만들지 않음. mmap과 달리 읽는 도중 파일이 잘려도 SIGBUS 없이 짧아진 내용을 해시)
+    - 순차 읽기임을 커널에 알려(posix_fadvise SEQUENTIAL) readahead 창을 키움 (지원 OS에서만)
+    - _DROP_CACHE_MIN_BYTES 이상인 파일은 다 읽은 뒤 페이지 캐시에서 내려 달라고 알림(POSIX_FADV_DONTNEED)
+      → 대용량 증거 파일이 이후 단계(시그니처/검색)에서 읽을 작은 파일들의 캐시를 밀어내지 않게 함
     """
     path = Path(path)
-    hashers: Dict[str, "hashlib._Hash"] = {}
-    try:
-        for algo in algorithms:
-            hashers[algo] = hashlib.new(algo)
-    except ValueError:
-        # 지원하지 않는 알고리즘 명
-        raise
+    algorithms = hash_columns(algorithms, compute_md5)
+    for algo in algorithms:
+        hashlib.new(algo)  # 지원하지 않는 알고리즘 명이면 여기서 ValueError
 
     try:
         with path.open("rb") as f:
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-                for h in hashers.values():
-                    h.update(chunk)
+            return hash_open_file(f, algorithms, chunk_size=chunk_size)
     except (PermissionError, FileNotFoundError, OSError):
         return None
 
+
+def hash_open_file(
+    f: BinaryIO,
+    algorithms: Tuple[str, ...] = ("sha256",),
+    *,
+    chunk_size: int = CHUNK_SIZE_DEFAULT,
+    head: bytes = b"",
+) -> Dict[str, str]:
+    """
+    이미 연 바이너리 파일 f를 현재 위치부터 끝까지 읽어 해시 계산 (compute_file_hashes의 본체).
+    - head: f에서 이미 읽은 앞부분. 해셔에 먼저 넣은 뒤 같은 핸들로 나머지를 이어서 읽음
+      → 파일을 다시 열지 않으므로, 그 사이 경로의 파일이 교체돼도 서로 다른 파일의 앞/뒤가 섞인 해시가 나오지 않음
+    - 읽기 방식/fadvise는 compute_file_hashes 설명과 같음
+    - 읽기 실패는 OSError 그대로 전달, 지원하지 않는 알고리즘 명이면 ValueError
+    """
+    hashers = {algo: hashlib.new(algo) for algo in algorithms}
+    _advise_sequential(f.fileno())
+    size = os.fstat(f.fileno()).st_size
+    if head:
+        for h in hashers.values():
+            h.update(head)
+    if len(hashers) == 1 and _HAS_FILE_DIGEST:
+        # 해셔를 그대로 넘겨 현재 위치부터 끝까지 이어서 계산
+        (h,) = hashers.values()
+        hashlib.file_digest(f, lambda: h)
+    else:
+        _hash_stream(f, hashers.values(), chunk_size)
+    _advise_dontneed(f.fileno(), size)
     return {name: h.hexdigest() for name, h in hashers.items()}
 
 
 def add_hashes_to_rows(
     rows: List[Dict[str, Union[str, int, float, None]]],
     *,
-    algorithms: Tuple[str, ...] = ("md5", "sha256"),
-    chunk_size: int = _CHUNK_SIZE_DEFAULT,
-    missing_as: str = ""  # 읽기 실패 시 빈 문자열로 채움
+    algorithms: Tuple[str, ...] = ("sha256",),
+    chunk_size: int = CHUNK_SIZE_DEFAULT,
+    missing_as: str = "",  # 읽기 실패 시 빈 문자열로 채움
+    workers: Optional[int] = None,
+    use_processes: bool = False,
+    compute_md5: bool = False,
+    dedup_only: bool = False,
 ) -> List[Dict[str, Union[str, int, float, None]]]:
     """
-    inventory(행 리스트)에 md5/sha256 열을 추가해서 반환.
+    inventory(행 리스트)에 해시 열(기본 sha256, compute_md5=True면 md5도)을 추가해서 반환.
     - rows의 각 행에 'path' 키가 있어야 함.
     - 실패(권한, 삭제 등) 시 해당 열을 missing_as 값으로 채움.
+    - 파일별 해시는 스레드 풀에서 병렬 계산 (hashlib이 update 중 GIL을 놓으므로 I/O와 해시가 겹침)
+        · 작은 파일은 묶음(batch) 단위로, 큰 파일은 한 개씩 작업으로 나눔
+        · workers: 동시 작업 수. None이면 스레드 풀은 min(32, CPU 코어 수 + 4), 프로세스 풀은 CPU 코어 수
+          (스레드는 읽기 대기가 대부분이라 코어 수보다 많이 띄워 디스크 큐 깊이를 확보)
+        · use_processes: True면 프로세스 풀 사용 (대용량 파일 위주로 CPU가 병목일 때)
+    - dedup_only=True: 중복 파일 찾기 전용 모드. 전체 해시는 중복 후보에만 계산하고 나머지는 missing_as
+        1) size_bytes가 유일한 파일 제외
+        2) 같은 크기끼리 앞/뒤 64KB 지문(xxh3 또는 blake2b)이 유일한 파일 제외
+        3) 남은 후보만 전체 해시
     """
+    algorithms = hash_columns(algorithms, compute_md5)
+    if workers is None:
+        workers = (os.cpu_count() or 1) if use_processes else _IO_WORKERS_DEFAULT
+
+    targets = []
     for row in rows:
-        p = row.get("path")
-        if not p:
+        if row.get("path"):
+            targets.append(row)
+        else:
             for algo in algorithms:
                 row[algo] = missing_as
-            continue
 
-        result = compute_file_hashes(p, algorithms, chunk_size=chunk_size)
-        if result is None:
-            for algo in algorithms:
-                row[algo] = missing_as
-        else:
-            for algo in algorithms:
-                row[algo] = result.get(algo, missing_as)
+    if not targets:
+        return rows
+
+    pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with pool_cls(max_workers=workers) as ex:
+        if dedup_only:
+            candidates = _duplicate_candidates(targets, ex)
+            for row in targets:
+                if id(row) not in candidates:
+                    for algo in algorithms:
+                        row[algo] = missing_as
+            targets = [row for row in targets if id(row) in candidates]
+
+        futs = {
+            ex.submit(_hash_file_batch, [row["path"] for row in batch], algorithms, chunk_size): batch
+            for batch in _pack_batches(targets)
+        }
+        for fut in as_completed(futs):
+            for row, result in zip(futs[fut], fut.result()):
+                if result is None:
+                    for algo in algorithms:
+                        row[algo] = missing_as
+                else:
+                    for algo in algorithms:
+                        row[algo] = result.get(algo, missing_as)
     return rows
+
+
+def hash_columns(algorithms: Tuple[str, ...], compute_md5: bool = False) -> Tuple[str, ...]:
+    """
+    compute_file_hashes / add_hashes_to_rows가 만드는 해시 열 이름(순서대로).
+    - compute_md5=True이고 algorithms에 md5가 없으면 맨 앞에 "md5" 추가
+    """
+    if compute_md5 and "md5" not in algorithms:
+        return ("md5",) + tuple(algorithms)
+    return tuple(algorithms)
+
+
+# 내부 함수
+
+def _hash_stream(f, hashers: Iterable["hashlib._Hash"], chunk_size: int) -> None:
+    """
+    f를 끝까지 chunk_size 단위로 readinto 해 모든 해셔에 같은 버퍼를 넘김 (버퍼 1개 재사용)
+    """
+    updates = [h.update for h in hashers]
+    buf = bytearray(chunk_size)
+    with memoryview(buf) as view:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            block = view[:n] if n < chunk_size else view
+            for update in updates:
+                update(block)
+
+
+def _advise_sequential(fd: int) -> None:
+    # 파일 전체를 처음부터 끝까지 읽을 예정임을 커널에 알림 (Linux 등 POSIX만, 실패해도 무시)
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+
+def _advise_dontneed(fd: int, size: int) -> None:
+    # 다 읽은 큰 파일의 페이지를 캐시에서 내려도 된다고 커널에 알림 (POSIX만, 실패해도 무시)
+    if size >= _DROP_CACHE_MIN_BYTES and hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def _hash_file_batch(
+    paths: List[str],
+    algorithms: Tuple[str, ...],
+    chunk_size: int,
+) -> List[Optional[Dict[str, str]]]:
+    """
+    파일 묶음을 한 작업 안에서 차례로 해시. 결과는 paths 순서와 같음.
+    """
+    return [compute_file_hashes(p, algorithms, chunk_size=chunk_size) for p in paths]
+
+
+def _duplicate_candidates(
+    rows: List[Dict[str, Union[str, int, float, None]]],
+    ex,
+) -> set:
+    """
+    중복일 수 있는 행들의 id() 집합을 반환.
+    - size_bytes가 없는 행은 판단 불가 → 후보로 유지
+    - 같은 크기 그룹 안에서 지문까지 겹치는 행만 후보
+    """
+    by_size: Dict[object, List[Dict[str, Union[str, int, float, None]]]] = {}
+    candidates = set()
+    for row in rows:
+        size = row.get("size_bytes")
+        if size is None or size == "":
+            candidates.add(id(row))
+            continue
+        by_size.setdefault(size, []).append(row)
+
+    groups = [group for group in by_size.values() if len(group) > 1]
+    flat = [row for group in groups for row in group]
+    prints = dict(zip(map(id, flat), ex.map(_fingerprint, [row["path"] for row in flat])))
+
+    for group in groups:
+        by_print: Dict[str, List[int]] = {}
+        for row in group:
+            fp = prints[id(row)]
+            if fp is None:
+                continue
+            by_print.setdefault(fp, []).append(id(row))
+        for ids in by_print.values():
+            if len(ids) > 1:
+                candidates.update(ids)
+    return candidates
+
+
+def _fingerprint(path: str) -> Optional[str]:
+    """
+    파일 앞/뒤 _FINGERPRINT_SPAN 바이트로 만든 가벼운 지문. 읽기 실패 시 None.
+    """
+    h = xxhash.xxh3_64() if _HAS_XXHASH else hashlib.blake2b(digest_size=8)
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            h.update(f.read(_FINGERPRINT_SPAN))
+            if size > _FINGERPRINT_SPAN:
+                f.seek(max(_FINGERPRINT_SPAN, size - _FINGERPRINT_SPAN))
+                h.update(f.read(_FINGERPRINT_SPAN))
+    except (PermissionError, FileNotFoundError, OSError):
+        return None
+    return h.hexdigest()
+
+
+def _pack_batches(
+    rows: List[Dict[str, Union[str, int, float, None]]],
+) -> List[List[Dict[str, Union[str, int, float, None]]]]:
+    """
+    size_bytes 기준으로 작은 파일들을 묶는다.
+    - 묶음 합계가 _BATCH_MAX_BYTES 또는 _BATCH_MAX_FILES에 닿으면 새 묶음 시작
+    - 그보다 큰 파일은 단독 묶음
+    """
+    batches: List[List[Dict[str, Union[str, int, float, None]]]] = []
+    current: List[Dict[str, Union[str, int, float, None]]] = []
+    current_bytes = 0
+    for row in rows:
+        try:
+            size = int(row.get("size_bytes") or 0)
+        except (TypeError, ValueError):
+            size = 0
+        if size >= _BATCH_MAX_BYTES:
+            batches.append([row])
+            continue
+        if current and (current_bytes + size > _BATCH_MAX_BYTES or len(current) >= _BATCH_MAX_FILES):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(row)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
@@ -1,10 +1,30 @@
 from __future__ import annotations
+import contextlib
 import csv
 import fnmatch
+import functools
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+_CSV_BUFFER_SIZE = 4 * 1024 * 1024  # 4MB
+
+# 디렉터리 순회 스레드 수 기본값
+_WALK_WORKERS_DEFAULT = min(8, os.cpu_count() or 1)
+
+# POSIX: 디렉터리를 fd로 열어 scandir(fd) → 파일 stat이 fstatat(dir_fd, 이름)으로 처리됨
+# (파일마다 전체 경로를 커널이 다시 풀지 않고, 스캔 도중 상위 경로가 바뀌어도 같은 디렉터리 기준)
+_HAS_FD_SCAN = os.scandir in os.supports_fd and os.stat in os.supports_dir_fd
+_O_DIRECTORY = getattr(os, "O_DIRECTORY", 0)
+
+# 순회 결과 파일 1개: (경로, 이름, stat 결과, 심볼릭 링크 여부)
+_FileRecord = Tuple[str, str, os.stat_result, bool]
+
+# 컴파일된 제외 규칙: (부분 문자열 세그먼트 목록, 나머지 글롭을 합친 정규식)
+ExcludeMatcher = Tuple[Tuple[str, ...], Optional[re.Pattern]]
+
 # api 작성
 
 def collect_inventory(
@@ -12,39 +32,89 @@ def collect_inventory(
     *,
     follow_symlinks: bool = False,
     exclude_globs: Optional[Iterable[str]] = None,
+    walk_workers: Optional[int] = None,
+    exclude_matcher: Optional[ExcludeMatcher] = None,
 ) -> List[Dict[str, Union[str, int, float, None]]]:
     """
     지정한 root 경로 아래 모든 파일의 메타데이터(경로, 크기, 시간)를 수집해 리스트[dict]로 반환.
     - follow_symlinks: 심볼릭 링크 따라갈지 여부
     - exclude_globs: 제외할 글롭 패턴들 (예: ["*.tmp", "*.log", "*/.git/*"])
+    - walk_workers: 디렉터리 순회 스레드 수. None이면 min(8, CPU 코어 수)
+    - exclude_matcher: build_exclude_matcher로 미리 컴파일한 제외 규칙 (지정하면 exclude_globs 대신 사용)
     """
     root = Path(root).resolve()
-    _compiled_exclude = tuple(exclude_globs or [])
+    _compiled_exclude = exclude_matcher if exclude_matcher is not None else build_exclude_matcher(exclude_globs)
 
     rows: List[Dict[str, Union[str, int, float, None]]] = []
-    for fpath in _iter_files(root, follow_symlinks=follow_symlinks, exclude_globs=_compiled_exclude):
-        meta = _safe_stat(fpath, follow_symlinks=follow_symlinks)
-        if meta is None:
-            # 접근 권한/깨진 링크 등으로 실패한 경우 스킵
-            continue
-
+    for spath, name, meta, is_symlink in _iter_files(
+        str(root),
+        follow_symlinks=follow_symlinks,
+        exclude=_compiled_exclude,
+        workers=walk_workers,
+    ):
+        # Path 객체를 만들지 않고 str/os.path로 바로 구성 (파일 수만큼 반복되는 구간)
         row = {
-            "path": str(fpath),
-            "name": fpath.name,
-            "parent": str(fpath.parent),
+            "path": spath,
+            "name": name,
+            "parent": os.path.dirname(spath),
             "size_bytes": meta.st_size,
             # 시간은 epoch(float). 이후 단계에서 타임존/형식을 일괄 변환하기 쉬움
             "mtime_epoch": meta.st_mtime,   # last modified
             "atime_epoch": meta.st_atime,   # last accessed
             "ctime_epoch": meta.st_ctime,   # metadata changed(Unix) / created(Windows)
             "birthtime_epoch": _birthtime(meta),  # 일부 OS에서만 제공. 없으면 None
-            "is_symlink": fpath.is_symlink(),
+            "is_symlink": is_symlink,
         }
         rows.append(row)
 
     return rows
 
 
+def build_exclude_matcher(exclude_globs: Optional[Iterable[str]] = None) -> ExcludeMatcher:
+    """
+    제외 글롭 목록을 한 번 컴파일해 collect_inventory/search_texts의 exclude_matcher로 넘길 규칙을 반환.
+    - 글롭 K개를 정규식 하나(| 로 묶은 alternation)로 합쳐 경로마다 한 번만 매칭
+    - 한 실행에서 여러 단계(인벤토리/검색)가 같은 규칙을 쓸 때 한 번만 만들어 공유
+    """
+    return _compile_exclude(tuple(exclude_globs or []))
+
+
+def is_excluded(spath: str, name: str, exclude: ExcludeMatcher) -> bool:
+    """
+    경로(spath)/파일명(name)이 build_exclude_matcher로 만든 제외 규칙에 걸리는지 여부.
+    - 경로 전체와 파일명 각각에 글롭 검사 (fnmatch.fnmatch와 같게 os.path.normcase 적용)
+    """
+    segments, regex = exclude
+    spath = os.path.normcase(spath)
+    for seg in segments:
+        if seg in spath:
+            return True
+    if regex is None:
+        return False
+    # 경로 전체/파일명 모두에 대해 글롭 검사
+    return regex.match(spath) is not None or regex.match(os.path.normcase(name)) is not None
+
+
+@contextlib.contextmanager
+def scandir_at(path: str) -> Iterator[Iterator[os.DirEntry]]:
+    """
+    디렉터리 하나를 os.scandir로 열어 DirEntry 이터레이터를 넘겨 줌 (with 문으로 사용).
+    - POSIX(_HAS_FD_SCAN)는 디렉터리를 fd로 열어 scandir(fd) → entry.stat이 fstatat(dir_fd, 이름)으로 처리됨
+    - fd 모드에서는 entry.path가 이름뿐이므로 경로가 필요하면 호출자가 path와 entry.name으로 조립
+    - 열기 실패(OSError)는 그대로 호출자에게 전달
+    """
+    if _HAS_FD_SCAN:
+        dir_fd = os.open(path, os.O_RDONLY | _O_DIRECTORY)
+        try:
+            with os.scandir(dir_fd) as it:
+                yield it
+        finally:
+            os.close(dir_fd)
+    else:
+        with os.scandir(path) as it:
+            yield it
+
+
 def write_inventory_csv(
     rows: List[Dict[str, Union[str, int, float, None]]],
     csv_path: Union[str, Path],
@@ -52,6 +122,7 @@ def write_inventory_csv(
     """
     collect_inventory 결과를 CSV로 저장.
     - 엑셀 호환을 위해 UTF-8 with BOM을 사용.
+    - csv.writer + 튜플 스트림으로 행 루프를 C 쪽에서 처리
     """
     csv_path = Path(csv_path)
     csv_path.parent.mkdir(parents=True, exist_ok=True)
@@ -62,64 +133,127 @@ def write_inventory_csv(
         "is_symlink",
     ]
 
-    with open(csv_path, "w", encoding="utf-8-sig", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-        writer.writeheader()
-        writer.writerows(rows)
+    with open(csv_path, "w", encoding="utf-8-sig", newline="", buffering=_CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows((r.get(k, "") for k in fieldnames) for r in rows)
 
 
 # 내부 함수 목록
 
 def _iter_files(
-    root: Path,
+    root: str,
     *,
     follow_symlinks: bool,
-    exclude_globs: Tuple[str, ...],
-) -> Iterator[Path]:
+    exclude: ExcludeMatcher,
+    workers: Optional[int] = None,
+) -> Iterator[_FileRecord]:
+    """
+    os.scandir 기반의 병렬 재귀 순회. 파일마다 (경로, 이름, stat, 심볼릭 링크 여부) 레코드를 넘김.
+    - 디렉터리 1개 스캔 = 스레드 풀 작업 1개. os.scandir/stat은 GIL을 놓으므로 서로 다른 하위 트리의 readdir가 겹침.
+    - 결과는 기존 스택 기반 깊이 우선 순회와 같은 순서로 꺼냄 (디렉터리의 파일 → 마지막 하위 디렉터리부터)
+      → 병렬로 스캔해도 CSV 행 순서가 순차 순회 때와 같음. 다음에 꺼낼 디렉터리부터 제출해 풀에서도 먼저 실행됨.
+    - 꺼낼 작업 스택이 비면(진행 중인 스캔 없음) 종료.
+    - 파일 종류/심볼릭 링크 여부는 readdir 단계 정보로 판정 (Windows는 stat까지 무료).
+    - stat에 실패한 파일(권한/깨진 링크 등)은 레코드를 만들지 않음.
+    - exclude(_compile_exclude 결과)에 매칭되면 디렉터리/파일 모두 스킵.
     """
-    os.scandir 기반의 빠른 재귀 순회.
-    - exclude_globs 패턴에 매칭되면 디렉터리/파일 모두 스킵.
+    if workers is None:
+        workers = _WALK_WORKERS_DEFAULT
+
+    ex = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        stack = [ex.submit(_scan_dir, root, follow_symlinks, exclude)]
+        while stack:
+            subdirs, files = stack.pop().result()
+            # 스택 top(마지막 하위 디렉터리)이 먼저 실행되도록 역순으로 제출한 뒤 원래 순서로 쌓음
+            futs = [ex.submit(_scan_dir, d, follow_symlinks, exclude) for d in reversed(subdirs)]
+            futs.reverse()
+            stack.extend(futs)
+            yield from files
+    finally:
+        # 소비 측이 중간에 멈춰도 남은 작업은 취소
+        ex.shutdown(wait=True, cancel_futures=True)
+
+
+def _scan_dir(
+    current: str,
+    follow_symlinks: bool,
+    exclude: ExcludeMatcher,
+) -> Tuple[List[str], List[_FileRecord]]:
+    """
+    디렉터리 하나를 스캔해 (하위 디렉터리 경로 목록, 파일 레코드 목록) 반환.
+    - scandir_at으로 읽음 (POSIX는 scandir(fd) + fstatat(dir_fd, 이름))
+    - 파일 stat도 여기서 불러 둠 (워커 스레드에서 병렬로 처리되도록)
     - 긴 경로/권한 오류는 안전하게 try/except로 무시하고 진행.
     """
-    stack = [root]
-    while stack:
-        current = stack.pop()
+    subdirs: List[str] = []
+    files: List[_FileRecord] = []
+    # scandir(fd)의 entry.path는 이름뿐이라 경로는 직접 조립 (scandir(경로)와 같은 규칙)
+    prefix = current if current.endswith(os.sep) else current + os.sep
+    try:
+        with scandir_at(current) as it:
+            _scan_entries(it, prefix, follow_symlinks, exclude, subdirs, files)
+    except (PermissionError, FileNotFoundError, OSError):
+        # 접근 불가/사라진 경로/디바이스 등은 조용히 패스
+        pass
+    return subdirs, files
+
+
+def _scan_entries(
+    it: Iterator[os.DirEntry],
+    prefix: str,
+    follow_symlinks: bool,
+    exclude: ExcludeMatcher,
+    subdirs: List[str],
+    files: List[_FileRecord],
+) -> None:
+    for entry in it:
+        name = entry.name
+        spath = prefix + name
+        # 제외 규칙
+        if is_excluded(spath, name, exclude):
+            continue
+
         try:
-            with os.scandir(current) as it:
-                for entry in it:
-                    path = Path(entry.path)
-                    # 제외 규칙
-                    if _is_excluded(path, exclude_globs):
-                        continue
-
-                    if entry.is_dir(follow_symlinks=follow_symlinks):
-                        stack.append(path)
-                    elif entry.is_file(follow_symlinks=follow_symlinks):
-                        yield path
-                    else:
-                        # 소켓/파이프/디바이스 파일은 스킵
-                        continue
+            if entry.is_dir(follow_symlinks=follow_symlinks):
+                subdirs.append(spath)
+            elif entry.is_file(follow_symlinks=follow_symlinks):
+                files.append((spath, name, entry.stat(follow_symlinks=follow_symlinks), entry.is_symlink()))
+            else:
+                # 소켓/파이프/디바이스 파일은 스킵
+                continue
         except (PermissionError, FileNotFoundError, OSError):
-            # 접근 불가/사라진 경로/디바이스 등은 조용히 패스
+            # 접근 권한/깨진 링크 등으로 stat 실패한 경우 스킵
             continue
 
 
-def _is_excluded(path: Path, patterns: Tuple[str, ...]) -> bool:
-    if not patterns:
-        return False
-    spath = str(path)
+@functools.lru_cache(maxsize=32)
+def _compile_exclude(patterns: Tuple[str, ...]) -> ExcludeMatcher:
+    """
+    제외 글롭 목록을 한 번만 컴파일해 (세그먼트 목록, 정규식)으로 반환.
+    - "*/.git/*"처럼 '*/이름/*' 형태(이름에 글롭 문자 없음)는 "/이름/" 부분 문자열 검사로 처리
+      (fnmatch 결과와 동일, 정규식까지 가지 않음)
+    - 나머지 패턴은 fnmatch.translate 결과를 | 로 묶은 정규식 하나로 합침
+    - fnmatch.fnmatch와 같게 os.path.normcase 적용
+    """
+    sep = os.sep
+    segments: List[str] = []
+    globs: List[str] = []
     for pat in patterns:
-        # 경로 전체/파일명 모두에 대해 글롭 검사
-        if fnmatch.fnmatch(spath, pat) or fnmatch.fnmatch(path.name, pat):
-            return True
-    return False
-
-
-def _safe_stat(path: Path, *, follow_symlinks: bool):
-    try:
-        return path.stat() if follow_symlinks else os.lstat(path)
-    except (PermissionError, FileNotFoundError, OSError):
-        return None
+        pat = os.path.normcase(pat)
+        inner = pat[2:-2]
+        if (
+            len(pat) > 4
+            and pat.startswith("*" + sep)
+            and pat.endswith(sep + "*")
+            and not any(c in inner for c in "*?[" + sep)
+        ):
+            segments.append(sep + inner + sep)
+        else:
+            globs.append(fnmatch.translate(pat))
+    regex = re.compile("|".join(globs)) if globs else None
+    return tuple(segments), regex
 
 
 def _birthtime(st) -> Optional[float]:
@@ -1,11 +1,36 @@
 # forensic_analyzer/search.py
 from __future__ import annotations
+import codecs
 import csv
-import fnmatch
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .inventory import ExcludeMatcher, build_exclude_matcher, is_excluded
+
+# pyahocorasick이 있으면 다중 키워드를 오토마톤 한 번으로 검사 가능, 없으면 re 경로로 진행
+try:
+    import ahocorasick  # type: ignore
+    _HAS_AHOCORASICK = True
+except Exception:
+    _HAS_AHOCORASICK = False
+
+_CSV_BUFFER_SIZE = 4 * 1024 * 1024  # 4MB
+
+# 디렉터리 순회 스레드 수 기본값
+_WALK_WORKERS_DEFAULT = min(8, os.cpu_count() or 1)
+
+# 대소문자 무시(re.IGNORECASE) 시 ASCII 문자와 같게 취급되는 비 ASCII 문자
+# 바이트 사전 필터가 이 문자들이 들어간 라인을 놓치지 않도록 후보에 포함
+_NON_ASCII_FOLDS = {"i": "\u0130\u0131", "k": "\u212a", "s": "\u017f"}
+
+_FOLD_TABLE = str.maketrans({c: k for k, chars in _NON_ASCII_FOLDS.items() for c in chars})
+
+# CRLF의 일부가 아닌 단독 CR (텍스트 모드에서는 이것도 줄바꿈)
+_LONE_CR = re.compile(rb"\r(?!\n)")
 
 # API 호출 부분
 
@@ -17,8 +42,7 @@ def is_text_path(
     경량 텍스트 파일 후보를 확장자 기반으로 판정.
     - include_exts: 'txt'처럼 점(.) 없는 소문자 확장자 목록
     """
-    p = Path(path)
-    ext = p.suffix.lower().lstrip(".")
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
     return ext in {e.lower().lstrip(".") for e in include_exts}
 
 
@@ -34,6 +58,9 @@ def search_texts(
     max_file_size_bytes: int = 10 * 1024 * 1024,  # 10MB
     encodings: Sequence[str] = ("utf-8", "cp949", "latin-1"),
     preview_max_len: int = 240,
+    walk_workers: Optional[int] = None,
+    backend: str = "re",
+    exclude_matcher: Optional[ExcludeMatcher] = None,
 ) -> List[Dict[str, Union[str, int]]]:
     """
     루트 폴더 아래 '경량 텍스트' 파일들을 라인 단위로 스캔하여 키워드(또는 정규식) 검색.
@@ -45,9 +72,20 @@ def search_texts(
     - line_preview: 매칭 라인의 미리보기(개행 제거, 길이 제한)
     - matched: 실제 매칭된 텍스트(정규식 사용 시 그룹 전체)
     - pattern: 검색 패턴(또는 키워드)
+    walk_workers: 디렉터리 순회 스레드 수. None이면 min(8, CPU 코어 수)
+    backend: "re"(기본) 또는 "ahocorasick"
+        · "ahocorasick": 키워드 전체를 Aho–Corasick 오토마톤 하나로 만들어 라인당 한 번만 훑고,
+          걸린 키워드의 패턴만 re로 위치 계산 (pyahocorasick 필요, 정규식 모드/없으면 re로 진행)
+    exclude_matcher: inventory.build_exclude_matcher로 미리 컴파일한 제외 규칙 (지정하면 exclude_globs 대신 사용)
+    빠른 경로: 정규식이 아닌 ASCII 키워드는 파일을 한 번에 읽어(크기 상한 이하) 바이트 단위로 먼저 훑고,
+    걸린 라인만 디코딩해 아래 라인 단위 검색과 같은 방식으로 판정 (UTF-16 BOM, 단독 CR 개행 파일 등은 기존 경로)
+    · 디코딩은 기존 경로(_open_text_lines)와 같은 인코딩을 strict로 사용. 파일 전체가 그 인코딩으로
+      디코딩되지 않으면 기존 경로로 넘겨 결과(디코딩 오류 시 파일 스킵)가 정규식 모드와 같게 유지
     """
     root = Path(root).resolve()
-    _ex_patterns = tuple(exclude_globs or [])
+    _ex_patterns = exclude_matcher if exclude_matcher is not None else build_exclude_matcher(exclude_globs)
+    if backend not in ("re", "ahocorasick"):
+        raise ValueError(f"unknown search backend: {backend}")
 
     if not keywords:
         return []
@@ -58,21 +96,43 @@ def search_texts(
         use_regex=use_regex,
         case_sensitive=case_sensitive,
     )
+    text_encoding = _text_encoding(encodings)
+    byte_prefilter = None if use_regex or text_encoding is None else _compile_byte_prefilter(
+        keywords,
+        case_sensitive=case_sensitive,
+        encodings=encodings,
+    )
+    keyword_filter = None
+    if backend == "ahocorasick" and not use_regex:
+        keyword_filter = _compile_ahocorasick(keywords, case_sensitive=case_sensitive)
 
     for fpath in _iter_files(
-        root,
+        str(root),
         follow_symlinks=follow_symlinks,
-        exclude_globs=_ex_patterns,
-        include_exts=tuple(include_exts),
+        exclude=_ex_patterns,
+        ext_set=frozenset(e.lower().lstrip(".") for e in include_exts),
+        workers=walk_workers,
     ):
         # 크기 상한
         try:
-            st = fpath.stat() if follow_symlinks else os.lstat(fpath)
+            st = os.stat(fpath) if follow_symlinks else os.lstat(fpath)
             if st.st_size > max_file_size_bytes:
                 continue
         except (OSError, PermissionError):
             continue
 
+        if byte_prefilter is not None:
+            try:
+                if _search_bytes(
+                    fpath, byte_prefilter, patterns, rows,
+                    encoding=text_encoding, preview_max_len=preview_max_len,
+                    keyword_filter=keyword_filter, max_bytes=max_file_size_bytes,
+                ):
+                    continue
+            except (OSError, ValueError):
+                # IO 오류 → 파일 스킵
+                continue
+
         # 인코딩 시도
         text_iter = _open_text_lines(fpath, encodings=encodings)
         if text_iter is None:
@@ -80,23 +140,10 @@ def search_texts(
 
         try:
             for lineno, line in enumerate(text_iter, start=1):
-                # 개행 제거(미리보기 안정화)
-                display_line = line.rstrip("\r\n")
-                for pat in patterns:
-                    m = pat.search(line)
-                    if not m:
-                        continue
-                    start, end = m.span()
-                    snippet = _shrink(display_line, start, end, max_len=preview_max_len)
-                    rows.append({
-                        "path": str(fpath),
-                        "line_no": lineno,
-                        "match_span_start": start,
-                        "match_span_end": end,
-                        "line_preview": snippet,
-                        "matched": m.group(0),
-                        "pattern": pat.pattern,
-                    })
+                _match_line(
+                    fpath, lineno, line, patterns, rows,
+                    preview_max_len=preview_max_len, keyword_filter=keyword_filter,
+                )
         except (UnicodeDecodeError, OSError):
             # 읽는 중 인코딩 깨짐/IO 오류 → 파일 스킵
             continue
@@ -125,58 +172,77 @@ def write_hits_csv(
         "line_preview",
     ]
 
-    with open(csv_path, "w", encoding="utf-8-sig", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-        writer.writeheader()
-        writer.writerows(rows)
+    with open(csv_path, "w", encoding="utf-8-sig", newline="", buffering=_CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows((r.get(k, "") for k in fieldnames) for r in rows)
 
 
 # 모듈 내부 함수 부분
 
 def _iter_files(
-    root: Path,
+    root: str,
     *,
     follow_symlinks: bool,
-    exclude_globs: Tuple[str, ...],
-    include_exts: Tuple[str, ...],
-) -> Iterator[Path]:
+    exclude: ExcludeMatcher,
+    ext_set: frozenset,
+    workers: Optional[int] = None,
+) -> Iterator[str]:
     """
-    os.scandir 기반 재귀 순회.
-    - exclude_globs와 매칭되면 디렉토리/파일 모두 스킵
-    - include_exts 확장자만 텍스트 후보로 취급
+    os.scandir 기반 병렬 재귀 순회. 파일 경로는 str로 넘김 (파일마다 Path 객체를 만들지 않음)
+    - 디렉토리 1개 스캔 = 스레드 풀 작업 1개 (scandir이 GIL을 놓으므로 하위 트리끼리 겹쳐서 진행)
+    - 결과는 기존 스택 기반 깊이 우선 순회와 같은 순서로 꺼냄 (디렉토리의 파일 → 마지막 하위 디렉토리부터)
+      → 병렬로 스캔해도 검색 결과 순서가 순차 순회 때와 같음
+    - exclude(build_exclude_matcher 결과)와 매칭되면 디렉토리/파일 모두 스킵
+    - ext_set(점 없는 소문자 확장자 집합, search_texts에서 한 번만 계산)에 든 확장자만 텍스트 후보로 취급
     """
-    stack = [root]
-    while stack:
-        current = stack.pop()
-        try:
-            with os.scandir(current) as it:
-                for entry in it:
-                    p = Path(entry.path)
-                    # 제외 규칙
-                    if _is_excluded(p, exclude_globs):
-                        continue
-
-                    try:
-                        if entry.is_dir(follow_symlinks=follow_symlinks):
-                            stack.append(p)
-                        elif entry.is_file(follow_symlinks=follow_symlinks):
-                            if is_text_path(p, include_exts=include_exts):
-                                yield p
-                    except (OSError, PermissionError):
-                        continue
-        except (OSError, PermissionError):
-            continue
+    if workers is None:
+        workers = _WALK_WORKERS_DEFAULT
 
+    ex = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        stack = [ex.submit(_scan_dir, root, follow_symlinks, exclude, ext_set)]
+        while stack:
+            subdirs, files = stack.pop().result()
+            # 스택 top(마지막 하위 디렉터리)이 먼저 실행되도록 역순으로 제출한 뒤 원래 순서로 쌓음
+            futs = [ex.submit(_scan_dir, d, follow_symlinks, exclude, ext_set) for d in reversed(subdirs)]
+            futs.reverse()
+            stack.extend(futs)
+            yield from files
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
 
-def _is_excluded(path: Path, patterns: Tuple[str, ...]) -> bool:
-    if not patterns:
-        return False
-    spath = str(path)
-    name = path.name
-    for pat in patterns:
-        if fnmatch.fnmatch(spath, pat) or fnmatch.fnmatch(name, pat):
-            return True
-    return False
+
+def _scan_dir(
+    current: str,
+    follow_symlinks: bool,
+    exclude: ExcludeMatcher,
+    ext_set: frozenset,
+) -> Tuple[List[str], List[str]]:
+    """
+    디렉토리 하나를 스캔해 (하위 디렉토리 경로 목록, 텍스트 후보 파일 경로 목록) 반환.
+    """
+    subdirs: List[str] = []
+    files: List[str] = []
+    try:
+        with os.scandir(current) as it:
+            for entry in it:
+                # 제외 규칙
+                if is_excluded(entry.path, entry.name, exclude):
+                    continue
+
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=follow_symlinks):
+                        # is_text_path와 같은 판정을 미리 만든 ext_set으로 바로 수행
+                        if os.path.splitext(entry.name)[1].lower().lstrip(".") in ext_set:
+                            files.append(entry.path)
+                except (OSError, PermissionError):
+                    continue
+    except (OSError, PermissionError):
+        pass
+    return subdirs, files
 
 
 def _compile_patterns(
@@ -196,8 +262,208 @@ def _compile_patterns(
     return patterns
 
 
+@dataclass(frozen=True)
+class _BytePrefilter:
+    needles: Tuple[bytes, ...]   # 키워드 바이트 (대소문자 무시 시 소문자)
+    folds: Tuple[bytes, ...]     # 이 바이트가 파일에 있으면 빠른 경로 포기 (_NON_ASCII_FOLDS 인코딩 표현)
+    lower: bool                  # True면 파일 바이트를 소문자로 바꾼 뒤 검색
+
+
+def _compile_byte_prefilter(
+    keywords: Sequence[str],
+    *,
+    case_sensitive: bool,
+    encodings: Sequence[str],
+) -> Optional[_BytePrefilter]:
+    """
+    키워드 후보 라인을 바이트 단위로 찾기 위한 준비.
+    - 키워드가 전부 비어있지 않은 ASCII이고 개행 문자가 없을 때만 만들고, 아니면 None
+    - re 교대(|) 패턴보다 bytes.find가 훨씬 빨라서 키워드별 find로 찾음
+    - 대소문자 무시 시 _NON_ASCII_FOLDS 문자의 각 인코딩 바이트 표현을 folds로 모아 둠
+    """
+    needles: List[bytes] = []
+    fold_chars = ""
+    for kw in keywords:
+        if not kw or not kw.isascii() or "\n" in kw or "\r" in kw:
+            return None
+        if case_sensitive:
+            needles.append(kw.encode("ascii"))
+        else:
+            needles.append(kw.lower().encode("ascii"))
+            fold_chars += "".join(_NON_ASCII_FOLDS.get(ch, "") for ch in kw.lower())
+
+    folds = set()
+    for ch in fold_chars:
+        for enc in encodings:
+            try:
+                folds.add(ch.encode(enc))
+            except (UnicodeEncodeError, LookupError):
+                continue
+    return _BytePrefilter(tuple(dict.fromkeys(needles)), tuple(sorted(folds)), not case_sensitive)
+
+
+def _search_bytes(
+    path: str,
+    prefilter: _BytePrefilter,
+    patterns: List[re.Pattern],
+    rows: List[Dict[str, Union[str, int]]],
+    *,
+    encoding: str,
+    preview_max_len: int,
+    keyword_filter: Optional[Callable[[str], List[int]]] = None,
+    max_bytes: Optional[int] = None,
+) -> bool:
+    """
+    파일 바이트에서 키워드가 들어있는 후보 라인만 찾아 디코딩 후 _match_line으로 판정.
+    - 파일은 read() 한 번으로 읽음 (호출 측에서 max_file_size_bytes 이하만 넘김, max_bytes로 한 번 더 제한:
+      stat 이후 상한을 넘도록 커진 파일은 크기 상한 초과와 같게 건너뜀).
+      mmap은 읽는 도중 파일이 잘리면(로그 로테이션 등) SIGBUS로 프로세스 전체가 죽으므로 사용하지 않음
+    - 처리했으면 True
+    - 이 경로로 처리할 수 없는 파일(UTF-16 BOM, 단독 CR 개행, folds 바이트 포함, encoding으로 strict 디코딩 불가)이면
+      rows를 건드리지 않고 False
+    - 후보 라인은 encoding(_text_encoding 결과)으로 디코딩 → 텍스트 모드로 연 기존 경로와 같은 문자열
+    - 라인 번호는 텍스트 모드(universal newlines)와 동일하게 계산
+    """
+    with open(path, "rb") as f:
+        data = f.read() if max_bytes is None else f.read(max_bytes + 1)
+    if max_bytes is not None and len(data) > max_bytes:
+        return True
+    if not data:
+        return True
+    if data[:2] in (b"\xff\xfe", b"\xfe\xff"):
+        return False
+    if _LONE_CR.search(data):
+        return False
+    if any(data.find(fold) != -1 for fold in prefilter.folds):
+        return False
+    try:
+        # 기존 경로는 디코딩 오류가 난 지점에서 파일을 버리므로, 전체가 유효할 때만 이 경로에서 처리
+        data.decode(encoding)
+    except UnicodeDecodeError:
+        return False
+
+    haystack = data.lower() if prefilter.lower else data
+
+    # 키워드가 걸린 라인의 시작 위치 모으기
+    line_starts = set()
+    for needle in prefilter.needles:
+        pos = haystack.find(needle)
+        while pos != -1:
+            line_start = haystack.rfind(b"\n", 0, pos) + 1
+            line_starts.add(line_start)
+            next_line = haystack.find(b"\n", pos)
+            if next_line == -1:
+                break
+            pos = haystack.find(needle, next_line + 1)
+
+    lineno = 1
+    counted_to = 0  # 여기까지의 개행은 lineno에 반영됨
+    for line_start in sorted(line_starts):
+        lineno += data.count(b"\n", counted_to, line_start)
+        counted_to = line_start
+
+        line_end = data.find(b"\n", line_start)
+        has_newline = line_end != -1
+        raw = data[line_start:line_end if has_newline else len(data)]
+        if raw.endswith(b"\r"):
+            raw = raw[:-1]
+        line = raw.decode(encoding)
+        if has_newline:
+            line += "\n"
+        _match_line(
+            path, lineno, line, patterns, rows,
+            preview_max_len=preview_max_len, keyword_filter=keyword_filter,
+        )
+    return True
+
+
+def _text_encoding(encodings: Sequence[str]) -> Optional[str]:
+    """
+    _open_text_lines가 실제로 파일을 여는 인코딩 = codecs에 등록된 첫 후보 (open 시점엔 디코딩하지 않으므로).
+    - 없으면 None
+    """
+    for enc in encodings:
+        try:
+            codecs.lookup(enc)
+        except LookupError:
+            continue
+        return enc
+    return None
+
+
+def _match_line(
+    path: str,
+    lineno: int,
+    line: str,
+    patterns: List[re.Pattern],
+    rows: List[Dict[str, Union[str, int]]],
+    *,
+    preview_max_len: int,
+    keyword_filter: Optional[Callable[[str], List[int]]] = None,
+) -> None:
+    """
+    라인 하나에 대해 패턴별 첫 매칭을 rows에 추가.
+    - keyword_filter가 있으면 그 라인에 나타난 키워드의 패턴만 검사
+    """
+    if keyword_filter is not None:
+        hit = keyword_filter(line)
+        if not hit:
+            return
+        patterns = [patterns[i] for i in hit]
+
+    # 개행 제거(미리보기 안정화)
+    display_line = line.rstrip("\r\n")
+    for pat in patterns:
+        m = pat.search(line)
+        if not m:
+            continue
+        start, end = m.span()
+        snippet = _shrink(display_line, start, end, max_len=preview_max_len)
+        rows.append({
+            "path": path,
+            "line_no": lineno,
+            "match_span_start": start,
+            "match_span_end": end,
+            "line_preview": snippet,
+            "matched": m.group(0),
+            "pattern": pat.pattern,
+        })
+
+
+def _compile_ahocorasick(
+    keywords: Sequence[str],
+    *,
+    case_sensitive: bool,
+) -> Optional[Callable[[str], List[int]]]:
+    """
+    키워드 전체로 Aho–Corasick 오토마톤을 만들고, 라인에 나타난 키워드 인덱스(오름차순)를 돌려주는 함수 반환.
+    - pyahocorasick이 없거나 빈 키워드가 있으면 None
+    - 대소문자 무시는 ASCII 키워드만 지원 (라인을 _FOLD_TABLE 변환 + lower()해서 검사).
+      비 ASCII 키워드는 re.IGNORECASE 규칙을 그대로 흉내낼 수 없어 None
+    """
+    if not _HAS_AHOCORASICK or not all(keywords):
+        return None
+    if not case_sensitive and not all(kw.isascii() for kw in keywords):
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for idx, kw in enumerate(keywords):
+        key = kw if case_sensitive else kw.lower()
+        automaton.add_word(key, automaton.get(key, ()) + (idx,))
+    automaton.make_automaton()
+
+    def hits(line: str) -> List[int]:
+        hay = line if case_sensitive else line.translate(_FOLD_TABLE).lower()
+        found = set()
+        for _, idxs in automaton.iter(hay):
+            found.update(idxs)
+        return sorted(found)
+
+    return hits
+
+
 def _open_text_lines(
-    path: Path,
+    path: str,
     *,
     encodings: Sequence[str],
 ) -> Optional[Iterator[str]]:
@@ -207,7 +473,7 @@ def _open_text_lines(
     """
     for enc in encodings:
         try:
-            f = path.open("r", encoding=enc, errors="strict")
+            f = open(path, "r", encoding=enc, errors="strict")
             # 파일 객체를 제너레이터로 감싸 반환
             return _line_iter(f)
         except (UnicodeDecodeError, LookupError):
@@ -217,7 +483,7 @@ def _open_text_lines(
             return None
     # 마지막 : 'errors=ignore'로 깨진 문자를 무시하고 읽기
     try:
-        f = path.open("r", encoding=encodings[0] if encodings else "utf-8", errors="ignore")
+        f = open(path, "r", encoding=encodings[0] if encodings else "utf-8", errors="ignore")
         return _line_iter(f)
     except (OSError, PermissionError):
         return None
@@ -3,9 +3,12 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
+import functools
 import io
 import os
 import mimetypes
+import posixpath
+import stat
 
 # python-magic (libmagic) 사용 시 더 정확한 판정 가능, 없으면 mimetypes(내장 라이브러리) 사용해서 진행
 try:
@@ -16,6 +19,9 @@ except Exception:
 
 
 
+# libmagic에 넘길 파일 앞부분 크기. 흔한 시그니처는 모두 이 범위 안에 있음
+HEAD_SIZE = 16 * 1024
+
 # 공개 API. 파일 종류 판별할 때 아래 함수 호출.
 
 def probe_file_type(
@@ -29,39 +35,28 @@ def probe_file_type(
         · real_ext는 MIME에서 추정한 확장자. 없으면 "".
     - 실패(접근 불가/읽기 실패 등) 시: None
     - python-magic(libmagic)가 있으면 그것을 우선 사용, 없으면 mimetypes 폴백
+        · libmagic에는 파일 앞 HEAD_SIZE(16KB)만 읽어 버퍼로 넘김 (큰 파일 전체를 읽지 않음)
+        · mimetypes 폴백은 확장자만 보므로 파일을 읽지 않음
     """
-    path = Path(path)
+    path = os.fspath(path)
 
-    # 접근/열기 가능한지 간단 체크
+    # 접근/열기 가능한지 간단 체크 (stat 한 번으로 일반 파일 여부까지)
     try:
-        st = path.stat()
-        if not path.is_file():
+        st = os.stat(path)
+        if not stat.S_ISREG(st.st_mode):
             return None
     except (OSError, PermissionError):
         return None
 
-    real_mime = ""
-    description = ""
-
+    head: Optional[bytes] = None
     if prefer_magic and _HAS_MAGIC:
+        # 시그니처는 파일 앞부분에 있으므로 앞 HEAD_SIZE 바이트만 읽어 libmagic에 넘김
         try:
-            # mime=True면 official MIME string, False면 인간 친화적 설명
-            real_mime = magic.from_file(str(path), mime=True) or ""
-            description = magic.from_file(str(path), mime=False) or ""
-        except Exception:
-            # libmagic 오류가 나면 mimetypes 대신 사용
-            real_mime, description = "", ""
-    if not real_mime:
-        mime_guess, _ = mimetypes.guess_type(str(path))
-        real_mime = mime_guess or ""
-        description = description or (real_mime if real_mime else "")
-
-    real_ext = _ext_from_mime(real_mime)
-    return {
-        "real_mime": real_mime,
-        "real_ext": real_ext,
-        "description": description,
-    }
+            with open(path, "rb") as f:
+                head = f.read(HEAD_SIZE)
+        except (OSError, PermissionError):
+            head = None  # 읽기 실패 → mimetypes(확장자) 폴백
+    return probe_from_bytes(path, head, prefer_magic=prefer_magic)
 
 
 def add_signature_to_rows(
@@ -94,26 +89,89 @@ def add_signature_to_rows(
             continue
 
         result = probe_file_type(p, prefer_magic=prefer_magic)
-        disk_ext = _disk_extension(str(p))
-
-        if result is None:
-            row[f"{sig_prefix}mime"] = missing_as
-            row[f"{sig_prefix}ext"] = missing_as
-            row[f"{sig_prefix}desc"] = missing_as
-            row["ext_mismatch"] = False
-            row[disk_ext_field] = disk_ext or missing_as
-        else:
-            row[f"{sig_prefix}mime"] = result.get("real_mime", "") or missing_as
-            row[f"{sig_prefix}ext"]  = result.get("real_ext", "") or missing_as
-            row[f"{sig_prefix}desc"] = result.get("description", "") or missing_as
-            row[disk_ext_field] = disk_ext or missing_as
-            row["ext_mismatch"] = _is_ext_mismatch(
-                disk_ext,
-                result.get("real_ext", ""),
-                result.get("real_mime", "")
-            )
+        fill_signature_columns(
+            row, str(p), result,
+            disk_ext_field=disk_ext_field, sig_prefix=sig_prefix, missing_as=missing_as,
+        )
     return rows
 
+
+def probe_from_bytes(
+    path: str,
+    head: Optional[bytes],
+    *,
+    prefer_magic: bool = True,
+) -> Dict[str, str]:
+    """
+    이미 읽어 둔 파일 앞부분(head)으로 probe_file_type과 같은 결과 dict를 만든다.
+    - head: 파일 앞 HEAD_SIZE 바이트 권장. None이면(읽지 않음/읽기 실패) 확장자 기반 mimetypes만 사용
+    - libmagic 모드가 아니면(prefer_magic=False 또는 python-magic 없음) head는 보지 않음
+    - libmagic 모드에서는 먼저 _SIGNATURES 접두 바이트 표를 보고, 없을 때만 libmagic 호출
+    """
+    real_mime = ""
+    description = ""
+
+    known = _match_signature(head) if head and prefer_magic and _HAS_MAGIC else None
+    if known is not None:
+        # 흔한 포맷은 접두 바이트만으로 확정 → libmagic 호출 생략 (설명은 libmagic 설명의 앞부분만)
+        real_mime, description = known
+    elif head is not None and prefer_magic and _HAS_MAGIC:
+        try:
+            # mime=True면 official MIME string, False면 인간 친화적 설명
+            if head:
+                real_mime = _magic_for(True).from_buffer(head) or ""
+                description = _magic_for(False).from_buffer(head) or ""
+            else:
+                # 빈 파일: 버퍼로는 "application/x-empty"가 나오므로 기존과 같게 from_file("inode/x-empty")
+                real_mime = _magic_for(True).from_file(path) or ""
+                description = _magic_for(False).from_file(path) or ""
+        except Exception:
+            # libmagic 오류가 나면 mimetypes 대신 사용
+            real_mime, description = "", ""
+    if not real_mime:
+        real_mime = _guess_mime(path)
+        description = description or (real_mime if real_mime else "")
+
+    real_ext = _ext_from_mime(real_mime)
+    return {
+        "real_mime": real_mime,
+        "real_ext": real_ext,
+        "description": description,
+    }
+
+
+def fill_signature_columns(
+    row: Dict[str, object],
+    path: str,
+    result: Optional[Dict[str, str]],
+    *,
+    disk_ext_field: str,
+    sig_prefix: str,
+    missing_as: str,
+) -> None:
+    """
+    probe_file_type / probe_from_bytes 결과(None이면 판정 실패)를 add_signature_to_rows의 열 형식으로 row에 기록.
+    """
+    disk_ext = _disk_extension(path)
+
+    if result is None:
+        row[f"{sig_prefix}mime"] = missing_as
+        row[f"{sig_prefix}ext"] = missing_as
+        row[f"{sig_prefix}desc"] = missing_as
+        row["ext_mismatch"] = False
+        row[disk_ext_field] = disk_ext or missing_as
+    else:
+        row[f"{sig_prefix}mime"] = result.get("real_mime", "") or missing_as
+        row[f"{sig_prefix}ext"]  = result.get("real_ext", "") or missing_as
+        row[f"{sig_prefix}desc"] = result.get("description", "") or missing_as
+        row[disk_ext_field] = disk_ext or missing_as
+        row["ext_mismatch"] = _is_ext_mismatch(
+            disk_ext,
+            result.get("real_ext", ""),
+            result.get("real_mime", "")
+        )
+
+
 # 이하 내부유틸!
 # mimetypes가 반환하는 확장자는 환경/플랫폼에 따라 None이거나 다소 특이할 수 있음 주의, 추후 재확인
 
@@ -125,6 +183,26 @@ _KNOWN_EXT_NORMALIZE = {
     ".htm": ".html",
 }
 
+# libmagic 없이 판정하는 흔한 포맷의 접두 바이트 (prefix, MIME, 설명). MIME은 libmagic 결과와 같은 값.
+# ZIP/PE(MZ)/ELF는 libmagic이 하위 유형(docx, jar, x-sharedlib 등)까지 구분하므로 여기 넣지 않음
+_SIGNATURES: Tuple[Tuple[bytes, str, str], ...] = (
+    (b"\x89PNG\r\n\x1a\n", "image/png", "PNG image data"),
+    (b"\xff\xd8\xff", "image/jpeg", "JPEG image data"),
+    (b"GIF87a", "image/gif", "GIF image data, version 87a"),
+    (b"GIF89a", "image/gif", "GIF image data, version 89a"),
+    (b"%PDF-", "application/pdf", "PDF document"),
+    (b"\x1f\x8b", "application/gzip", "gzip compressed data"),
+    (b"BZh", "application/x-bzip2", "bzip2 compressed data"),
+    (b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed", "7-zip archive data"),
+    (b"\xfd7zXZ\x00", "application/x-xz", "XZ compressed data"),
+)
+
+# 첫 바이트 → 해당 바이트로 시작하는 시그니처들 (긴 접두어 먼저). import 시 한 번만 구성
+_SIGNATURES_BY_FIRST_BYTE: Dict[int, Tuple[Tuple[bytes, str, str], ...]] = {}
+for _sig in sorted(_SIGNATURES, key=lambda s: len(s[0]), reverse=True):
+    _SIGNATURES_BY_FIRST_BYTE[_sig[0][0]] = _SIGNATURES_BY_FIRST_BYTE.get(_sig[0][0], ()) + (_sig,)
+del _sig
+
 def _normalize_ext(ext: str) -> str:
     ext = (ext or "").strip().lower()
     if not ext:
@@ -136,18 +214,51 @@ def _normalize_ext(ext: str) -> str:
 
 def _disk_extension(path: str) -> str:
     # 순수 디스크상 확장자 (".txt" 형태). 만약에 없으면 ""
-    ext = Path(path).suffix
+    ext = os.path.splitext(path)[1]
     return _normalize_ext(ext)
 
 
+def _match_signature(head: bytes) -> Optional[Tuple[str, str]]:
+    # 첫 바이트로 후보를 고른 뒤 긴 접두어부터 비교. 없으면 None
+    for prefix, mime, description in _SIGNATURES_BY_FIRST_BYTE.get(head[0], ()):
+        if head.startswith(prefix):
+            return mime, description
+    return None
+
+
+@functools.lru_cache(maxsize=None)
 def _ext_from_mime(mime: str) -> str:
-    # MIME → 확장자 추정 (없거나 모르면 "")
+    # MIME → 확장자 추정 (없거나 모르면 ""). MIME 종류는 한정적이라 전부 캐시
     if not mime:
         return ""
     guessed = mimetypes.guess_extension(mime) or ""
     return _normalize_ext(guessed)
 
 
+def _guess_mime(path: str) -> str:
+    """
+    mimetypes.guess_type(path)[0] 과 같은 결과를 마지막 확장자 2개 기준 캐시로 반환 (없으면 "").
+    - guess_type은 posixpath.splitext로 끝 확장자(.gz 같은 인코딩이면 그 앞 확장자까지)만 봄
+    - "data:" URL 형태는 캐시 없이 그대로 위임
+    """
+    if path[:5].lower() == "data:":
+        return mimetypes.guess_type(path)[0] or ""
+    base, ext = posixpath.splitext(path)
+    inner_ext = posixpath.splitext(base)[1] if ext else ""
+    return _guess_mime_by_suffixes(inner_ext, ext)
+
+
+@functools.lru_cache(maxsize=4096)
+def _guess_mime_by_suffixes(inner_ext: str, ext: str) -> str:
+    return mimetypes.guess_type("x" + inner_ext + ext)[0] or ""
+
+
+@functools.lru_cache(maxsize=None)
+def _magic_for(mime: bool) -> "magic.Magic":
+    # libmagic DB를 한 번만 열어 재사용 (Magic 객체는 내부 lock으로 스레드 간 공유 가능)
+    return magic.Magic(mime=mime)
+
+
 def _is_ext_mismatch(disk_ext: str, real_ext: str, real_mime: str) -> bool:
     """
     확장자/시그니처 불일치 판정.
@@ -3,9 +3,17 @@ from __future__ import annotations
 import csv
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple, Union
 
+# numpy가 있으면 순수 파이썬 경로의 최종 정렬에서 시각(1차 키) 정렬을 C 쪽에서 처리 (numpy는 정렬할 때 처음 import)
+# pandas 경로는 import(~0.2s)와 DataFrame 고정 비용이 커서 행이 많을 때만 사용 (pandas는 그때 처음 import)
+_PANDAS_MIN_ROWS = 50000
+
+_CSV_BUFFER_SIZE = 4 * 1024 * 1024  # 4MB
+
+_EPOCH_NAIVE = datetime(1970, 1, 1)
 
 #api
 
@@ -46,8 +54,25 @@ def build_timeline_rows(
         · 0    → UTC
         · 정수 → 해당 오프셋(분) 적용 (예: KST=+540)
     - drop_na: 타임스탬프가 None/0/음수 등 유효하지 않으면 행을 생성하지 않음
+    - 행이 _PANDAS_MIN_ROWS 이상이고 pandas가 설치되어 있으면 같은 결과를 열 단위 연산으로 만듦
+      (_build_timeline_rows_pandas)
     """
     tzinfo = _resolve_tzinfo(tz_offset_minutes)
+    pd = _load_pandas() if len(rows) >= _PANDAS_MIN_ROWS else None
+    if pd is not None:
+        return _build_timeline_rows_pandas(
+            pd,
+            rows,
+            events=events,
+            tzinfo=tzinfo,
+            drop_na=drop_na,
+            emit_inventory_fields=emit_inventory_fields,
+            iso_with_tz=iso_with_tz,
+        )
+
+    # 고정 오프셋이므로 행마다 astimezone 하지 않고, 오프셋을 더한 기준 시각 + 접미사를 한 번만 계산
+    local_epoch, offset_suffix = _local_epoch_and_suffix(tzinfo, with_tz=iso_with_tz)
+
     out: List[Dict[str, Union[str, int, float, bool]]] = []
 
     for row in rows:
@@ -62,7 +87,7 @@ def build_timeline_rows(
                 else:
                     epoch = 0.0
 
-            ts_iso = _epoch_to_iso(epoch, tzinfo=tzinfo, with_tz=iso_with_tz)
+            ts_iso = (local_epoch + timedelta(seconds=epoch)).isoformat(timespec="seconds") + offset_suffix
             out.append({
                 **base,
                 "event": spec.label,
@@ -71,8 +96,7 @@ def build_timeline_rows(
             })
 
     # 시간 오름차순 정렬
-    out.sort(key=lambda r: (r.get("ts_epoch", 0.0), str(r.get("path", "")), str(r.get("event", ""))))
-    return out
+    return _sort_timeline_rows(out)
 
 
 def write_timeline_csv(
@@ -101,15 +125,141 @@ def write_timeline_csv(
     csv_path = Path(csv_path)
     csv_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(csv_path, "w", encoding="utf-8-sig", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-        writer.writeheader()
-        writer.writerows(timeline_rows)
+    with open(csv_path, "w", encoding="utf-8-sig", newline="", buffering=_CSV_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows((r.get(k, "") for k in fieldnames) for r in timeline_rows)
 
 
 #파일 내부 함수
 
 
+@lru_cache(maxsize=1)
+def _load_numpy():
+    """numpy 모듈을 처음 필요할 때 import해서 반환. 없으면 None."""
+    try:
+        import numpy as np  # type: ignore
+    except Exception:
+        return None
+    return np
+
+
+@lru_cache(maxsize=1)
+def _load_pandas():
+    """pandas 모듈을 처음 필요할 때 import해서 반환. pandas/numpy가 없으면 None."""
+    if _load_numpy() is None:
+        return None
+    try:
+        import pandas as pd  # type: ignore
+    except Exception:
+        return None
+    return pd
+
+
+def _build_timeline_rows_pandas(
+    pd,
+    rows: List[Dict[str, Union[str, int, float, bool, None]]],
+    *,
+    events: Tuple[EventSpec, ...],
+    tzinfo: timezone,
+    drop_na: bool,
+    emit_inventory_fields: Tuple[str, ...],
+    iso_with_tz: bool,
+) -> List[Dict[str, Union[str, int, float, bool]]]:
+    """
+    build_timeline_rows의 pandas/NumPy 버전. 결과(값, 순서, ts_iso 문자열)는 순수 파이썬 경로와 동일.
+    - 이벤트별 epoch 열을 한 번에 숫자로 변환(pd.to_numeric)하고, (행 번호, 이벤트 번호, epoch)로 세로로 펼침
+    - 정렬은 (ts_epoch, path, event, 원래 순서) 키로 DataFrame 한 번에 처리
+    - ts_iso: datetime.fromtimestamp와 같은 방식(마이크로초 half-even 반올림 후 초 단위 절삭)으로 초를 구하고
+      np.datetime_as_string으로 일괄 문자열화
+    - 출력 dict는 정렬된 인덱스로 마지막에 한 번만 만듦 (DataFrame.to_dict는 값마다 박싱 비용이 큼)
+    """
+    np = _load_numpy()
+    n = len(rows)
+    row_idx_parts, event_idx_parts, epoch_parts = [], [], []
+    for event_idx, spec in enumerate(events):
+        epochs = pd.to_numeric(
+            pd.Series([r.get(spec.field) for r in rows], dtype=object), errors="coerce"
+        ).to_numpy(dtype="float64")
+        valid = epochs > 0  # NaN도 False
+        if drop_na:
+            row_idx = np.flatnonzero(valid)
+            epochs = epochs[valid]
+        else:
+            row_idx = np.arange(n)
+            epochs = np.where(valid, epochs, 0.0)
+        row_idx_parts.append(row_idx)
+        event_idx_parts.append(np.full(len(row_idx), event_idx))
+        epoch_parts.append(epochs)
+
+    row_idx = np.concatenate(row_idx_parts)
+    if not len(row_idx):
+        return []
+    event_idx = np.concatenate(event_idx_parts)
+    labels = [spec.label for spec in events]
+
+    # 파이썬 경로의 정렬 키 str(x.get("path", ""))와 같게: path를 내보내지 않으면 ""
+    if "path" in emit_inventory_fields:
+        path_keys = np.array([str(r.get("path")) for r in rows], dtype=object)
+    else:
+        path_keys = np.full(n, "", dtype=object)
+
+    frame = pd.DataFrame({
+        "ts_epoch": np.concatenate(epoch_parts),
+        "path": path_keys[row_idx],
+        "event": np.array(labels, dtype=object)[event_idx],
+        "row": row_idx,
+        "ev": event_idx,
+    })
+    frame = frame.sort_values(["ts_epoch", "path", "event", "row", "ev"], kind="mergesort")
+
+    ts = frame["ts_epoch"].to_numpy()
+    whole = np.trunc(ts)
+    carry = np.round((ts - whole) * 1e6) >= 1e6
+    local_epoch, suffix = _local_epoch_and_suffix(tzinfo, with_tz=iso_with_tz)
+    offset_s = int((local_epoch - _EPOCH_NAIVE).total_seconds())
+    secs = whole.astype("int64") + carry.astype("int64") + offset_s
+    iso = np.datetime_as_string(secs.astype("datetime64[s]"), unit="s").tolist()
+
+    bases = [{k: r.get(k) for k in emit_inventory_fields} for r in rows]
+    return [
+        {**bases[ri], "event": labels[ei], "ts_epoch": epoch, "ts_iso": s + suffix}
+        for ri, ei, epoch, s in zip(
+            frame["row"].tolist(), frame["ev"].tolist(), ts.tolist(), iso
+        )
+    ]
+
+
+def _sort_timeline_rows(
+    out: List[Dict[str, Union[str, int, float, bool]]],
+) -> List[Dict[str, Union[str, int, float, bool]]]:
+    """
+    (ts_epoch, path, event) 오름차순 정렬.
+    - numpy가 있으면: ts_epoch만 np.argsort(stable)로 정렬한 뒤, ts가 같은 구간만 파이썬으로 (path, event) 정렬
+      (문자열 키까지 np.lexsort에 넣으면 object 배열 비교라 list.sort보다 느림)
+    - 없으면 list.sort 한 번
+    """
+    np = _load_numpy() if len(out) >= 2 else None
+    if np is None:
+        out.sort(key=lambda r: (r.get("ts_epoch", 0.0), str(r.get("path", "")), str(r.get("event", ""))))
+        return out
+
+    ts = np.fromiter((r.get("ts_epoch", 0.0) for r in out), dtype=np.float64, count=len(out))
+    order = np.argsort(ts, kind="stable")
+    sorted_ts = ts[order]
+    result = [out[i] for i in order.tolist()]
+
+    # 같은 ts가 이어지는 구간 [start, end) 중 길이 2 이상만 2·3차 키로 다시 정렬
+    bounds = np.flatnonzero(sorted_ts[1:] != sorted_ts[:-1]) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [len(result)]))
+    ties = np.flatnonzero(ends - starts > 1)
+    tie_key = lambda r: (str(r.get("path", "")), str(r.get("event", "")))
+    for start, end in zip(starts[ties].tolist(), ends[ties].tolist()):
+        result[start:end] = sorted(result[start:end], key=tie_key)
+    return result
+
+
 def _resolve_tzinfo(tz_offset_minutes: Optional[int]) -> timezone:
     """
     분 단위 오프셋으로 tzinfo를 만든다.
@@ -133,13 +283,14 @@ def _to_epoch_float(v: object) -> Optional[float]:
     return f
 
 
-def _epoch_to_iso(epoch: float, *, tzinfo: timezone, with_tz: bool = True) -> str:
+def _local_epoch_and_suffix(tzinfo: timezone, *, with_tz: bool = True) -> Tuple[datetime, str]:
     """
-    epoch(UTC 기준)을 지정한 tzinfo 시각의 ISO 8601 문자열로 변환.
-    - with_tz=True면 오프셋 포함 (예: 2025-10-02T11:22:33+09:00)
+    고정 오프셋 tzinfo에 대해 (오프셋을 더한 naive epoch 기준 시각, ISO 오프셋 접미사) 반환.
+    - (기준 시각 + timedelta(seconds=epoch)).isoformat(timespec="seconds") + 접미사
+      == datetime.fromtimestamp(epoch, tz=timezone.utc).astimezone(tzinfo).isoformat(timespec="seconds")
+      (timedelta도 fromtimestamp와 같이 마이크로초 half-even 반올림)
+    - with_tz=True면 접미사 포함 (예: "+09:00"), False면 ""
     """
-    dt = datetime.fromtimestamp(epoch, tz=timezone.utc).astimezone(tzinfo)
-    if with_tz:
-        return dt.isoformat(timespec="seconds")
-    # 오프셋을 숨기고 ISO만
-    return dt.replace(tzinfo=None).isoformat(timespec="seconds")
+    offset = tzinfo.utcoffset(None)
+    suffix = datetime(2000, 1, 1, tzinfo=tzinfo).isoformat()[19:] if with_tz else ""
+    return _EPOCH_NAIVE + offset, suffix
@@ -1,22 +1,73 @@
 # forensic_analyzer/validate.py
 from __future__ import annotations
 import csv
+import hashlib
+import json
 import math
 import os
 import random
-from dataclasses import dataclass, asdict
+import re
+import sys
+import tempfile
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 # 내부 모듈(해시 재검증 용)
 try:
-    from .hashing import compute_file_hashes
+    from .hashing import CHUNK_SIZE_DEFAULT, compute_file_hashes
 except Exception:
-    compute_file_hashes = None  # 선택적 의존
+    compute_file_hashes = None  # 선택적 의존. 없으면 _hash_file_fallback 사용
+    CHUNK_SIZE_DEFAULT = 4 * 1024 * 1024  # hashing을 import할 수 없을 때만 쓰는 값
+
+# 디렉터리 스캔은 inventory와 같은 방식 (POSIX는 scandir(fd) → entry.stat이 fstatat(dir_fd, 이름))
+from .inventory import scandir_at
+
+_CSV_BUFFER_SIZE = 4 * 1024 * 1024  # 4MB
+
+# 디렉터리별 lstat 스캔 스레드 수 기본값 (I/O 대기 위주라 CPU 수보다 넉넉히)
+_STAT_WORKERS_DEFAULT = min(64, (os.cpu_count() or 4) * 4)
+
+# 이슈 수준/코드 상수 (모든 Issue가 같은 문자열 객체를 공유, 호출 측에서 필터링할 때도 사용)
+SEV_ERROR = sys.intern("ERROR")
+SEV_WARN = sys.intern("WARN")
+SEV_INFO = sys.intern("INFO")
+
+CODE_MISSING_FIELD = sys.intern("MISSING_FIELD")
+CODE_FILE_NOT_FOUND = sys.intern("FILE_NOT_FOUND")
+CODE_SIZE_MISSING = sys.intern("SIZE_MISSING")
+CODE_SIZE_MISMATCH = sys.intern("SIZE_MISMATCH")
+CODE_TS_MISSING = sys.intern("TS_MISSING")
+CODE_TS_BAD_TYPE = sys.intern("TS_BAD_TYPE")
+CODE_TS_OUT_OF_RANGE = sys.intern("TS_OUT_OF_RANGE")
+CODE_EXT_MISMATCH = sys.intern("EXT_MISMATCH")
+CODE_DUP_PATH = sys.intern("DUP_PATH")
+CODE_HASH_VERIFY_ERROR = sys.intern("HASH_VERIFY_ERROR")
+CODE_HASH_VERIFY_READ_FAIL = sys.intern("HASH_VERIFY_READ_FAIL")
+CODE_HASH_EXPECTED_MISSING = sys.intern("HASH_EXPECTED_MISSING")
+CODE_HASH_ACTUAL_MISSING = sys.intern("HASH_ACTUAL_MISSING")
+CODE_HASH_BAD_HEX = sys.intern("HASH_BAD_HEX")
+
+# 기록된 해시값 형식 검사용 (bytes.fromhex는 공백을 건너뛰므로 fromhex 전에 16진수 문자만인지 확인)
+_HEX_RE = re.compile(r"[0-9a-fA-F]+")
+CODE_HASH_VERIFY_FAIL = sys.intern("HASH_VERIFY_FAIL")
+
+# write_issues_csv 컬럼 순서 (보기 좋게 수준/코드 먼저)와 Issue → 행 튜플 변환
+_ISSUE_FIELDS = ("severity", "code", "path", "field", "value", "detail")
+_issue_row = attrgetter(*_ISSUE_FIELDS)
+_issue_key = attrgetter("severity", "code")
 
 #데이터 모델
 
-@dataclass(frozen=True)
+# 3.10+는 slots 데이터클래스 → 인스턴스마다 __dict__를 만들지 않음 (이슈가 수백만 개일 때 메모리/생성 비용 감소)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class Issue:
     path: str
     code: str             # 예: MISSING_FIELD, SIZE_MISMATCH, HASH_VERIFY_FAIL …
@@ -41,174 +92,208 @@ def validate_inventory_rows(
     epoch_min: float = 0.0,  # 음수 epoch은 기본적으로 이상치로 간주
     allow_missing_birthtime: bool = True,
     detect_duplicate_paths: bool = True,
-) -> List[Issue]:
+    stat_workers: Optional[int] = None,
+) -> Iterator[Issue]:
     """
-    인벤토리/확장 컬럼을 가진 rows(list[dict])에 대해 기본 검증을 수행한다.
+    인벤토리/확장 컬럼을 가진 rows(list[dict])에 대해 기본 검증을 수행하고 이슈를 하나씩 yield 한다.
+    (이슈 리스트를 쌓지 않음. 리스트가 필요하면 collect()로 감쌈)
     - 필수 필드 존재 여부
     - 파일 존재 여부(선택)
     - size_bytes가 실제 파일 크기와 일치하는지(선택)
     - 타임스탬프(epoch) 이상치(음수/None/NaN)
     - 중복 path
     - (선택) birthtime_epoch는 OS에 따라 없을 수 있으므로 옵션으로 허용
+    - 이슈를 만드는 메인 루프는 rows를 한 번 순회: 행마다 필수 필드 → 존재/크기(lstat 1회) → 타임스탬프
+      → 확장자 불일치 순으로 검사, 중복 path는 루프 뒤 Counter(C 구현)로 한 번에 집계해 이슈로 추가
+      (이슈 순서: 행 순서대로, 그 뒤에 DUP_PATH)
+    - 메인 루프 전후로 rows를 더 훑음: 타임스탬프 마스크(numpy 있을 때 시간 필드마다 1번),
+      lstat 캐시 경로 수집(check_file_exists/check_size_matches 시 1번), 중복 path 집계(detect_duplicate_paths 시 1번)
+      → rows는 여러 번 순회 가능한 시퀀스(list)여야 함
+    - numpy가 있으면 타임스탬프 열을 먼저 배열로 만들어 NaN/누락/epoch_min 미만 후보 행만 표시하고,
+      루프에서는 후보 행만 파이썬으로 세부 판정 (정상 행은 타임스탬프 검사 생략)
+    - 존재/크기 검사용 lstat은 상위 디렉터리별로 묶어 scandir 한 번으로 미리 받아 둠 (_build_lstat_cache).
+      캐시에 없는 경로만 os.lstat으로 직접 확인
+        · stat_workers: 디렉터리 스캔 스레드 수. None이면 min(64, CPU 코어 수 * 4)
     """
-    issues: List[Issue] = []
-
-    # 1) 필수 필드
-    for r in rows:
-        p = str(r.get("path", ""))
-        for f in required_fields:
-            if f not in r or r.get(f) in (None, ""):
-                issues.append(Issue(p, "MISSING_FIELD", "ERROR", f"필수 필드 누락", field=f))
-
-    # 2) 파일 존재 & 크기 일치
-    if check_file_exists or check_size_matches:
-        for r in rows:
-            p = str(r.get("path", ""))
-            if not p:
-                continue
-            try:
-                st = os.lstat(p)
-            except (OSError, PermissionError):
-                if check_file_exists:
-                    issues.append(Issue(p, "FILE_NOT_FOUND", "ERROR", "파일에 접근 불가 또는 존재하지 않음"))
-                continue
+    # 루프 안에서 자주 쓰는 전역/속성은 지역 변수로
+    _Issue = Issue
+    _lstat = os.lstat
+    _isnan = math.isnan
+    _to_int = _to_int_safely
+    _to_float = _to_float_safely
+    check_fs = check_file_exists or check_size_matches
+    # 필드명은 이슈마다 field= 로 들어가므로 한 번만 intern (호출 측이 만든 문자열도 상수와 같은 객체로)
+    required_fields = tuple(sys.intern(f) for f in required_fields)
+    # 필수 필드가 모두 있고 비어 있지 않은 행(대부분)은 집합 포함 검사 + itemgetter 한 번으로 통과 (둘 다 C 구현)
+    required_set = frozenset(required_fields)
+    get_required = itemgetter(*required_fields) if len(required_fields) > 1 else None
 
-            if check_size_matches:
-                inv_size = _to_int_safely(r.get("size_bytes"))
-                if inv_size is None:
-                    issues.append(Issue(p, "SIZE_MISSING", "ERROR", "size_bytes 누락/비정상", field="size_bytes"))
-                else:
-                    if int(st.st_size) != int(inv_size):
-                        issues.append(Issue(
-                            p, "SIZE_MISMATCH", "WARN",
-                            f"실제({st.st_size}) ≠ 기록({inv_size})", field="size_bytes",
-                            value=str(inv_size)
-                        ))
-
-    # 3) 타임스탬프 검증
     time_fields = ["mtime_epoch", "atime_epoch", "ctime_epoch"]
     # birthtime_epoch는 OS에 따라 없을 수 있음
     if not allow_missing_birthtime:
         time_fields.append("birthtime_epoch")
 
-    for r in rows:
+    ts_suspect = _ts_suspect_mask(rows, time_fields, epoch_min)
+    stat_cache = _build_lstat_cache((str(r.get("path", "")) for r in rows), workers=stat_workers) if check_fs else {}
+    _cached_stat = stat_cache.get
+
+    for i, r in enumerate(rows):
         p = str(r.get("path", ""))
-        for tf in time_fields:
+
+        # 1) 필수 필드 (누락/빈 값이 있을 때만 필드 순서대로 다시 훑어 이슈 생성)
+        if r.keys() >= required_set:
+            if get_required is not None:
+                required_vals = get_required(r)
+            else:
+                required_vals = tuple(r[f] for f in required_fields)
+            required_ok = None not in required_vals and "" not in required_vals
+        else:
+            required_ok = False
+        if not required_ok:
+            for f in required_fields:
+                if f not in r or r.get(f) in (None, ""):
+                    yield _Issue(p, CODE_MISSING_FIELD, SEV_ERROR, f"필수 필드 누락", field=f)
+
+        # 2) 파일 존재 & 크기 일치
+        if check_fs and p:
+            try:
+                st = _cached_stat(p) or _lstat(p)
+            except (OSError, PermissionError):
+                st = None
+                if check_file_exists:
+                    yield _Issue(p, CODE_FILE_NOT_FOUND, SEV_ERROR, "파일에 접근 불가 또는 존재하지 않음")
+
+            if st is not None and check_size_matches:
+                inv_size = _to_int(r.get("size_bytes"))
+                if inv_size is None:
+                    yield _Issue(p, CODE_SIZE_MISSING, SEV_ERROR, "size_bytes 누락/비정상", field="size_bytes")
+                elif int(st.st_size) != int(inv_size):
+                    yield _Issue(
+                        p, CODE_SIZE_MISMATCH, SEV_WARN,
+                        f"실제({st.st_size}) ≠ 기록({inv_size})", field="size_bytes",
+                        value=str(inv_size)
+                    )
+
+        # 3) 타임스탬프 검증
+        for tf in (time_fields if ts_suspect is None or ts_suspect[i] else ()):
             if tf not in r or r.get(tf) in (None, ""):
-                issues.append(Issue(p, "TS_MISSING", "WARN", "타임스탬프 누락", field=tf))
+                yield _Issue(p, CODE_TS_MISSING, SEV_WARN, "타임스탬프 누락", field=tf)
                 continue
-            fv = _to_float_safely(r.get(tf))
-            if fv is None or math.isnan(fv):
-                issues.append(Issue(p, "TS_BAD_TYPE", "WARN", "타임스탬프 값이 숫자가 아님", field=tf, value=str(r.get(tf))))
+            fv = _to_float(r.get(tf))
+            if fv is None or _isnan(fv):
+                yield _Issue(p, CODE_TS_BAD_TYPE, SEV_WARN, "타임스탬프 값이 숫자가 아님", field=tf, value=str(r.get(tf)))
                 continue
             if fv < epoch_min:
-                issues.append(Issue(p, "TS_OUT_OF_RANGE", "WARN", f"비정상(epoch<{epoch_min})", field=tf, value=str(fv)))
-
-    # 4) 중복 path
-    if detect_duplicate_paths:
-        seen: Dict[str, int] = {}
-        for r in rows:
-            p = str(r.get("path", ""))
-            if not p:
-                continue
-            seen[p] = seen.get(p, 0) + 1
-        for p, count in seen.items():
-            if count > 1:
-                issues.append(Issue(p, "DUP_PATH", "WARN", f"중복 path {count}개"))
+                yield _Issue(p, CODE_TS_OUT_OF_RANGE, SEV_WARN, f"비정상(epoch<{epoch_min})", field=tf, value=str(fv))
 
-    # 5) 시그니처-확장자 불일치 표시(있다면)
-    for r in rows:
-        p = str(r.get("path", ""))
+        # 4) 시그니처-확장자 불일치 표시(있다면)
         ext_mismatch = r.get("ext_mismatch")
         if isinstance(ext_mismatch, bool) and ext_mismatch:
-            issues.append(Issue(p, "EXT_MISMATCH", "INFO", "확장자와 시그니처 불일치", field="ext_mismatch", value="True"))
+            yield _Issue(p, CODE_EXT_MISMATCH, SEV_INFO, "확장자와 시그니처 불일치", field="ext_mismatch", value="True")
 
-    return issues
+    # 5) 중복 path
+    if detect_duplicate_paths:
+        dup_counts = Counter(p for r in rows if (p := str(r.get("path", ""))))
+        for p, c in dup_counts.items():
+            if c > 1:
+                yield _Issue(p, CODE_DUP_PATH, SEV_WARN, f"중복 path {c}개")
 
 
 def sample_verify_hashes(
-    rows: List[Dict[str, object]],
+    rows: Iterable[Dict[str, object]],
     *,
-    algorithms: Tuple[str, ...] = ("md5", "sha256"),
+    algorithms: Tuple[str, ...] = ("sha256",),
     sample_ratio: float = 0.05,       # 전체의 5% 샘플링
     sample_min: int = 5,
     sample_max: int = 200,
-    chunk_size: int = 1024 * 1024,
+    chunk_size: int = CHUNK_SIZE_DEFAULT,
     missing_as: str = "",
-) -> List[Issue]:
+    workers: Optional[int] = None,
+    cache_path: Optional[Union[str, Path]] = None,
+) -> Iterator[Issue]:
     """
-    인벤토리 rows 중 일부 샘플을 골라 해시를 재계산하여 CSV의 해시와 일치하는지 검증한다.
-    - rows[*]['path']와 rows[*][algo] (예: 'md5','sha256')가 존재한다고 가정
-    - compute_file_hashes가 사용 가능할 때만 동작. 불가 시 INFO 이슈 한 건으로 통보.
+    인벤토리 rows 중 일부 샘플을 골라 해시를 재계산하여 CSV의 해시와 일치하는지 검증하고 이슈를 yield 한다.
+    - rows[*]['path']와 rows[*][algo] (예: 'sha256')가 존재한다고 가정
+    - rows는 한 번만 순회하면 되는 iterable이어도 됨 (후보 리스트를 따로 만들지 않고 저수지 샘플링, 메모리 O(sample_max))
+    - 파일마다 한 번만 읽어 모든 알고리즘 해셔에 같은 버퍼를 넘김 (알고리즘 수만큼 다시 읽지 않음)
+        · compute_file_hashes 사용 (다중 알고리즘이면 readinto 버퍼 하나를 모든 해셔가 공유)
+        · hashing 모듈 import 실패 시 _hash_file_fallback(같은 단일 패스 read 루프)으로 대체
+    - 샘플 파일들은 스레드 풀에서 동시에 재계산 (파일끼리 독립, hashlib이 update 중 GIL을 놓음)
+        · workers: 동시 작업 수. None이면 min(32, CPU 코어 수 * 2)
+        · 샘플은 inode 순으로 정렬해 제출 (HDD에서 탐색 거리 감소). 이슈 순서도 이 순서를 따름
+    - cache_path: 재계산 결과 캐시(JSON). 지정하면 (크기, mtime_ns)가 지난번과 같은 파일은 다시 읽지 않고
+      캐시의 다이제스트로 비교, 새로 계산한 값은 캐시에 기록해 끝날 때 원자적으로 저장
+        · mtime은 사용자가 바꿀 수 있으므로, 원본 바이트 재확인이 필요한 감사에서는 지정하지 말 것
     """
-    issues: List[Issue] = []
-
-    if compute_file_hashes is None:
-        issues.append(Issue("", "HASH_VERIFY_SKIPPED", "INFO", "compute_file_hashes 사용 불가(모듈 import 실패)"))
-        return issues
-
-    # 샘플 구성
-    candidates = [r for r in rows if r.get("path")]
-    n = len(candidates)
+    # 샘플 구성: k는 후보 수 n에 따라 정해지므로 k의 상한(sample_max)만큼 저수지를 채우며 n을 셈
+    reservoir, n = _reservoir_sample((r for r in rows if r.get("path")), sample_max)
     if n == 0:
-        return issues
+        return
 
     k = min(max(int(n * sample_ratio), sample_min), sample_max)
-    sample = random.sample(candidates, k) if n > k else candidates
+    # 균등 표본(저수지)에서 다시 균등하게 k개 → 전체 후보에서 균등하게 k개를 뽑은 것과 같음
+    sample = random.sample(reservoir, k) if n > k else reservoir
+    sample = sorted(sample, key=_inode_of)
 
-    for r in sample:
-        p = str(r.get("path"))
-        try:
-            result = compute_file_hashes(p, algorithms=algorithms, chunk_size=chunk_size)
-        except ValueError as e:
-            # 지원하지 않는 알고리즘 등
-            issues.append(Issue(p, "HASH_VERIFY_ERROR", "ERROR", f"해시 계산 실패: {e}"))
-            continue
+    if workers is None:
+        workers = min(32, (os.cpu_count() or 4) * 2)
 
-        if result is None:
-            issues.append(Issue(p, "HASH_VERIFY_READ_FAIL", "WARN", "파일 읽기 실패(권한/손상 등)"))
-            continue
+    cache = _load_verify_cache(cache_path) if cache_path else None
 
-        for algo in algorithms:
-            expected = str(r.get(algo, missing_as) or missing_as)
-            actual = result.get(algo, missing_as) or missing_as
-            if not expected:
-                issues.append(Issue(p, "HASH_EXPECTED_MISSING", "WARN", f"{algo} 값 누락", field=algo))
-                continue
-            if not actual:
-                issues.append(Issue(p, "HASH_ACTUAL_MISSING", "WARN", f"{algo} 재계산 실패", field=algo))
-                continue
-            if expected.lower() != actual.lower():
-                issues.append(Issue(
-                    p, "HASH_VERIFY_FAIL", "ERROR",
-                    f"{algo} 불일치: expected={expected[:12]}… actual={actual[:12]}…",
-                    field=algo, value=expected
-                ))
-    return issues
+    def verify(r: Dict[str, object]) -> List[Issue]:
+        return _verify_one(r, algorithms=algorithms, chunk_size=chunk_size, missing_as=missing_as, cache=cache)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+            for found in ex.map(verify, sample):
+                yield from found
+    finally:
+        # 소비 측이 중간에 멈춰도 그때까지 계산한 결과는 캐시에 남김
+        if cache is not None:
+            _save_verify_cache(cache, cache_path)
+
+
+def collect(issues: Iterable[Issue]) -> List[Issue]:
+    """
+    validate_inventory_rows/sample_verify_hashes가 yield 하는 이슈를 리스트로 모음 (여러 번 순회/len이 필요할 때).
+    """
+    return list(issues)
 
 
 def write_issues_csv(
-    issues: List[Issue],
+    issues: Iterable[Issue],
     csv_path: Union[str, Path],
-) -> None:
+) -> Dict[str, int]:
     """
-    Issue 리스트를 CSV로 기록(UTF-8 with BOM; 엑셀 호환).
+    Issue들을 CSV로 기록(UTF-8 with BOM; 엑셀 호환)하고 summarize_issues와 같은 형식의 요약 카운트를 반환.
+    - asdict/DictWriter 대신 attrgetter로 컬럼 순서대로 튜플을 뽑아 csv.writer에 바로 넘김
+    - 제너레이터를 받아도 한 번만 순회 (기록하면서 집계하므로 이슈 리스트를 따로 쥐고 있을 필요 없음)
+    - 집계는 이슈마다 (수준, 코드) 쌍 카운트 1회, 끝나고 수준/코드별 합계로 펼침
     """
     csv_path = Path(csv_path)
     csv_path.parent.mkdir(parents=True, exist_ok=True)
 
-    fieldnames = ["severity", "code", "path", "field", "value", "detail"]
-    with open(csv_path, "w", encoding="utf-8-sig", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for iss in issues:
-            row = asdict(iss)
-            # 보기 좋게 컬럼 순서 맞추기
-            ordered = {k: row.get(k, "") for k in fieldnames}
-            w.writerow(ordered)
+    pair_counts: Dict[Tuple[str, str], int] = Counter()
+
+    def counted(it: Iterable[Issue]) -> Iterator[Tuple[str, ...]]:
+        for iss in it:
+            pair_counts[_issue_key(iss)] += 1
+            yield _issue_row(iss)
 
+    with open(csv_path, "w", encoding="utf-8-sig", newline="", buffering=_CSV_BUFFER_SIZE) as f:
+        w = csv.writer(f)
+        w.writerow(_ISSUE_FIELDS)
+        w.writerows(counted(issues))
+
+    # 쌍은 처음 나온 순서대로 펼치므로 키 순서도 summarize_issues와 같음
+    summary: Dict[str, int] = {}
+    for (severity, code), n in pair_counts.items():
+        summary[severity] = summary.get(severity, 0) + n
+        summary[code] = summary.get(code, 0) + n
+    return summary
 
-def summarize_issues(issues: List[Issue]) -> Dict[str, int]:
+
+def summarize_issues(issues: Iterable[Issue]) -> Dict[str, int]:
     """
     이슈를 수준/코드별로 집계해 요약 카운트를 반환.
     예: {"ERROR": 10, "WARN": 32, "INFO": 5, "HASH_VERIFY_FAIL": 2, ...}
@@ -223,6 +308,289 @@ def summarize_issues(issues: List[Issue]) -> Dict[str, int]:
 #내부 함수 부분
 
 
+def _reservoir_sample(items: Iterable[Dict[str, object]], size: int) -> Tuple[List[Dict[str, object]], int]:
+    """
+    items를 한 번 순회하며 최대 size개를 균등 확률로 뽑아 (표본, 전체 개수) 반환 (Algorithm R).
+    - 전체가 size개 이하면 순서 그대로 모두 담김
+    """
+    reservoir: List[Dict[str, object]] = []
+    randrange = random.randrange
+    n = 0
+    for n, item in enumerate(items, 1):
+        if n <= size:
+            reservoir.append(item)
+        else:
+            j = randrange(n)
+            if j < size:
+                reservoir[j] = item
+    return reservoir, n
+
+
+def _verify_one(
+    r: Dict[str, object],
+    *,
+    algorithms: Tuple[str, ...],
+    chunk_size: int,
+    missing_as: str,
+    cache: Optional[Dict[str, dict]] = None,
+) -> List[Issue]:
+    """
+    샘플 행 하나의 해시를 재계산해 기록값과 비교, 발견한 이슈 목록을 반환 (워커 스레드에서 실행).
+    - cache가 있으면 _cached_file_hashes로 변하지 않은 파일의 재계산을 건너뜀
+    - 16진수 문자열을 bytes.fromhex로 풀어 다이제스트 바이트끼리 비교 (대소문자 무관, lower() 사본 없음)
+    - 기록값이 재계산 값과 같은 자릿수의 16진수 문자열이 아니면(길이 다름/공백·비16진 문자 포함) HASH_BAD_HEX
+    """
+    issues: List[Issue] = []
+    p = str(r.get("path"))
+    try:
+        result = _cached_file_hashes(p, algorithms=algorithms, chunk_size=chunk_size, cache=cache)
+    except ValueError as e:
+        # 지원하지 않는 알고리즘 등
+        issues.append(Issue(p, CODE_HASH_VERIFY_ERROR, SEV_ERROR, f"해시 계산 실패: {e}"))
+        return issues
+
+    if result is None:
+        issues.append(Issue(p, CODE_HASH_VERIFY_READ_FAIL, SEV_WARN, "파일 읽기 실패(권한/손상 등)"))
+        return issues
+
+    for algo in algorithms:
+        expected = str(r.get(algo, missing_as) or missing_as)
+        actual = result.get(algo, missing_as) or missing_as
+        if not expected:
+            issues.append(Issue(p, CODE_HASH_EXPECTED_MISSING, SEV_WARN, f"{algo} 값 누락", field=algo))
+            continue
+        if not actual:
+            issues.append(Issue(p, CODE_HASH_ACTUAL_MISSING, SEV_WARN, f"{algo} 재계산 실패", field=algo))
+            continue
+        if len(expected) != len(actual) or _HEX_RE.fullmatch(expected) is None:
+            issues.append(Issue(
+                p, CODE_HASH_BAD_HEX, SEV_ERROR, f"{algo} 기록값이 {len(actual)}자리 16진수 해시가 아님",
+                field=algo, value=expected
+            ))
+            continue
+        try:
+            matched = bytes.fromhex(expected) == bytes.fromhex(actual)
+        except ValueError:
+            # 재계산 값 자리에 missing_as 같은 표시 문자열이 들어온 경우
+            matched = False
+        if not matched:
+            issues.append(Issue(
+                p, CODE_HASH_VERIFY_FAIL, SEV_ERROR,
+                f"{algo} 불일치: expected={expected[:12]}… actual={actual[:12]}…",
+                field=algo, value=expected
+            ))
+    return issues
+
+
+def _cached_file_hashes(
+    path: str,
+    *,
+    algorithms: Tuple[str, ...],
+    chunk_size: int,
+    cache: Optional[Dict[str, dict]],
+) -> Optional[Dict[str, str]]:
+    """
+    파일 해시 계산. cache가 있으면 {경로: {"size", "mtime_ns", "digests"}} 항목을 재사용/갱신.
+    - (size, mtime_ns)가 캐시와 같고 요청한 알고리즘 다이제스트가 모두 있으면 파일을 읽지 않음
+    - 새로 계산한 값은 계산 전후 stat이 같을 때만 캐시에 기록 (계산 도중 바뀐 파일은 기록하지 않음)
+    - 캐시 dict는 워커 스레드들이 공유: 경로별 항목 교체(dict 대입 1회)만 하므로 잠금 불필요
+    """
+    hash_file = compute_file_hashes if compute_file_hashes is not None else _hash_file_fallback
+    if cache is None:
+        return hash_file(path, algorithms=algorithms, chunk_size=chunk_size)
+
+    try:
+        st = os.stat(path)
+    except OSError:
+        return hash_file(path, algorithms=algorithms, chunk_size=chunk_size)
+    key = (st.st_size, st.st_mtime_ns)
+
+    entry = cache.get(path)
+    known: Dict[str, str] = {}
+    if isinstance(entry, dict) and (entry.get("size"), entry.get("mtime_ns")) == key:
+        known = entry.get("digests") or {}
+        if all(known.get(algo) for algo in algorithms):
+            return {algo: known[algo] for algo in algorithms}
+
+    result = hash_file(path, algorithms=algorithms, chunk_size=chunk_size)
+    if result is None:
+        return None
+    try:
+        st_after = os.stat(path)
+    except OSError:
+        return result
+    if (st_after.st_size, st_after.st_mtime_ns) == key:
+        digests = dict(known)
+        digests.update((algo, result[algo]) for algo in algorithms if result.get(algo))
+        cache[path] = {"size": key[0], "mtime_ns": key[1], "digests": digests}
+    return result
+
+
+def _load_verify_cache(cache_path: Union[str, Path]) -> Dict[str, dict]:
+    """검증 캐시(JSON) 로드. 없거나 깨진 파일이면 빈 캐시"""
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_verify_cache(cache: Dict[str, dict], cache_path: Union[str, Path]) -> None:
+    """검증 캐시를 같은 폴더의 임시 파일에 쓰고 fsync 후 os.replace로 교체 (중간에 끊겨도 이전 캐시 유지)"""
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", delete=False, dir=cache_path.parent) as tf:
+        json.dump(cache, tf, ensure_ascii=False)
+        tf.flush()
+        os.fsync(tf.fileno())
+        tmp_name = tf.name
+    os.replace(tmp_name, cache_path)
+
+
+def _hash_file_fallback(
+    path: str,
+    algorithms: Tuple[str, ...],
+    *,
+    chunk_size: int,
+) -> Optional[Dict[str, str]]:
+    """
+    compute_file_hashes를 쓸 수 없을 때의 대체 구현 (반환 규칙 동일: 읽기 실패 시 None, 모르는 알고리즘은 ValueError).
+    - 파일을 한 번만 읽고, readinto로 채운 버퍼의 memoryview를 모든 해셔에 복사 없이 넘김
+    """
+    hashers = [(algo, hashlib.new(algo)) for algo in algorithms]
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    try:
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                block = view[:n]
+                for _, h in hashers:
+                    h.update(block)
+    except (PermissionError, FileNotFoundError, OSError):
+        return None
+    return {algo: h.hexdigest() for algo, h in hashers}
+
+
+def _inode_of(r: Dict[str, object]) -> int:
+    # 정렬용 inode 번호 (lstat 실패 시 0 → 앞쪽에 모임)
+    try:
+        return os.lstat(str(r.get("path"))).st_ino
+    except (OSError, ValueError):
+        return 0
+
+
+def _build_lstat_cache(
+    paths: Iterable[str],
+    *,
+    workers: Optional[int] = None,
+) -> Dict[str, os.stat_result]:
+    """
+    경로들을 상위 디렉터리별로 묶어 디렉터리마다 scandir 한 번으로 lstat 결과를 모아 {경로: stat} 반환.
+    - 행에 나온 이름만 stat (디렉터리의 나머지 항목은 건드리지 않음)
+    - POSIX는 디렉터리 fd 기준 fstatat이라 파일마다 전체 경로를 다시 풀지 않음, Windows는 readdir 정보로 stat 무료
+    - 디렉터리 1개 = 스레드 풀 작업 1개 (scandir/stat은 GIL을 놓으므로 콜드 캐시/네트워크 FS에서 대기 시간이 겹침)
+    - 스캔 실패 디렉터리/목록에 없는 이름은 캐시에 넣지 않음 → 호출 측에서 os.lstat으로 확인
+    """
+    by_dir: Dict[str, Dict[str, List[str]]] = defaultdict(lambda: defaultdict(list))
+    for p in paths:
+        if p:
+            d, name = os.path.split(p)
+            by_dir[d or os.curdir][name].append(p)
+
+    if workers is None:
+        workers = _STAT_WORKERS_DEFAULT
+    workers = max(1, min(workers, len(by_dir)))
+
+    cache: Dict[str, os.stat_result] = {}
+    if workers == 1:
+        for group in by_dir.items():
+            cache.update(_stat_dir_group(group))
+        return cache
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for found in ex.map(_stat_dir_group, by_dir.items()):
+            cache.update(found)
+    return cache
+
+
+def _stat_dir_group(group: Tuple[str, Dict[str, List[str]]]) -> Dict[str, os.stat_result]:
+    """디렉터리 하나를 스캔해 wanted 이름들의 lstat 결과를 {경로: stat}으로 반환 (실패 시 빈 dict)"""
+    d, wanted = group
+    found: Dict[str, os.stat_result] = {}
+    try:
+        with scandir_at(d) as it:
+            _stat_wanted_entries(it, wanted, found)
+    except OSError:
+        # 접근 불가/사라진 디렉터리 → 해당 경로들은 os.lstat으로 개별 처리
+        pass
+    return found
+
+
+def _stat_wanted_entries(
+    it: Iterable[os.DirEntry],
+    wanted: Dict[str, List[str]],
+    cache: Dict[str, os.stat_result],
+) -> None:
+    for entry in it:
+        ps = wanted.get(entry.name)
+        if ps is None:
+            continue
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        for p in ps:
+            cache[p] = st
+
+
+@lru_cache(maxsize=1)
+def _load_numpy():
+    """
+    numpy 모듈을 처음 필요할 때 import해서 반환. 없으면 None.
+    - numpy가 있으면 타임스탬프 이상치 후보를 열 단위로 한 번에 판정, 없으면 행마다 파이썬으로 검사
+    """
+    try:
+        import numpy as np  # type: ignore
+    except Exception:
+        return None
+    return np
+
+
+def _ts_suspect_mask(
+    rows: List[Dict[str, object]],
+    time_fields: Sequence[str],
+    epoch_min: float,
+) -> Optional[List[bool]]:
+    """
+    numpy로 타임스탬프 이슈가 있을 수 있는 행을 표시 (하나라도 누락/숫자 아님/NaN/epoch_min 미만이면 True).
+    - False인 행은 모든 time_fields가 epoch_min 이상의 숫자 → 파이썬 검사에서도 이슈 없음
+    - numpy가 없으면 None (모든 행을 파이썬으로 검사)
+    """
+    np = _load_numpy() if rows else None
+    if np is None:
+        return None
+    mask = np.zeros(len(rows), dtype=bool)
+    for tf in time_fields:
+        col = [r.get(tf) for r in rows]
+        try:
+            # 숫자/None(→NaN)만 있으면 C 루프 한 번으로 변환. 문자열은 float()와 같은 규칙으로 파싱
+            vals = np.array(col, dtype=np.float64)
+        except (TypeError, ValueError):
+            vals = np.fromiter((_float_or_nan(v) for v in col), dtype=np.float64, count=len(col))
+        # NaN(누락/숫자 아님)이거나 epoch_min 미만인 위치를 mask에 OR
+        with np.errstate(invalid="ignore"):
+            mask |= np.isnan(vals) | (vals < epoch_min)
+    return mask.tolist()
+
+
+def _float_or_nan(v: object) -> float:
+    fv = _to_float_safely(v)
+    return math.nan if fv is None else fv
+
+
 def _to_int_safely(v: object) -> Optional[int]:
     try:
         return int(v)  # float도 int로 안전 캐스팅
@@ -2,21 +2,25 @@
 from __future__ import annotations
 import argparse
 import csv
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Dict, Iterable, Iterator, List, Union
 
 # 내부 모듈
-from forensic_analyzer.inventory import collect_inventory
+from forensic_analyzer.inventory import build_exclude_matcher, collect_inventory
+from forensic_analyzer.analyze import analyze_files
 from forensic_analyzer.hashing import add_hashes_to_rows
 from forensic_analyzer.signature import add_signature_to_rows
 from forensic_analyzer.search import search_texts, write_hits_csv
 from forensic_analyzer.timeline import build_timeline_rows, write_timeline_csv
 from forensic_analyzer.validate import (
-    validate_inventory_rows, sample_verify_hashes,
-    write_issues_csv, summarize_issues
+    Issue, validate_inventory_rows, sample_verify_hashes, collect,
+    write_issues_csv, SEV_ERROR, SEV_WARN, SEV_INFO
 )
 from forensic_analyzer.foroutput import ensure_dir, make_outpath
 
+_CSV_BUFFER_SIZE = 4 * 1024 * 1024  # 4MB
 
 # CSV 저장
 def _ensure_parent(path: Union[str, Path]) -> Path:
@@ -37,17 +41,15 @@ def _write_csv_dynamic(rows: List[Dict[str, object]], out_path: Union[str, Path]
         "is_symlink", "md5", "sha256",
         "sig_mime", "sig_ext", "sig_desc", "ext_on_disk", "ext_mismatch",
     ]
-    keys_order: List[str] = []
-    seen = set(preferred)
-    keys_order.extend(preferred)
-    
+    # dict를 순서 있는 집합으로 사용: 처음 나온 키만 뒤에 추가됨 (값은 쓰지 않음)
+    # 행마다 dict.update(r) 한 번 → 키 중복 검사를 C 루프에서 처리 (dict.fromkeys(r) 사본도 만들지 않음)
+    ordered = dict.fromkeys(preferred)
+    update = ordered.update
     for r in rows:
-        for k in r.keys():
-            if k not in seen:
-                seen.add(k)
-                keys_order.append(k)
+        update(r)
+    keys_order: List[str] = list(ordered)
 
-    with open(out, "w", encoding="utf-8-sig", newline="") as f:
+    with open(out, "w", encoding="utf-8-sig", newline="", buffering=_CSV_BUFFER_SIZE) as f:
         w = csv.DictWriter(f, fieldnames=keys_order, extrasaction="ignore")
         w.writeheader()
         w.writerows(rows)
@@ -55,20 +57,27 @@ def _write_csv_dynamic(rows: List[Dict[str, object]], out_path: Union[str, Path]
     print(f"[OK] saved {len(rows)} rows -> {out}")
 
 
-# inventory 서브커맨드
-def cmd_inventory(args: argparse.Namespace) -> None:
-    print("[DBG] running inventory, root=", args.root)
-    rows = collect_inventory(
-        args.root,
-        follow_symlinks=args.follow_symlinks,
-        exclude_globs=args.exclude,
-    )
+# --with-hash / --with-signature 열 추가
+def _add_file_columns(rows: List[Dict[str, object]], args: argparse.Namespace) -> List[Dict[str, object]]:
+    # 둘 다 켜져 있으면 파일당 한 번만 여는 analyze_files로 함께 처리 (프로세스 풀 요청 시에는 기존 단계별 처리)
+    if args.with_hash and args.with_signature and not args.hash_processes:
+        return analyze_files(
+            rows,
+            algorithms=tuple(args.hash_algorithms),
+            chunk_size=args.hash_block_size,
+            prefer_magic=not args.sig_no_magic,
+            disk_ext_field="ext_on_disk",
+            sig_prefix="sig_",
+            workers=args.hash_workers,
+        )
 
     if args.with_hash:
         rows = add_hashes_to_rows(
             rows,
             algorithms=tuple(args.hash_algorithms),
             chunk_size=args.hash_block_size,
+            workers=args.hash_workers,
+            use_processes=args.hash_processes,
         )
 
     if args.with_signature:
@@ -78,6 +87,19 @@ def cmd_inventory(args: argparse.Namespace) -> None:
             disk_ext_field="ext_on_disk",
             sig_prefix="sig_",
         )
+    return rows
+
+
+# inventory 서브커맨드
+def cmd_inventory(args: argparse.Namespace) -> None:
+    print("[DBG] running inventory, root=", args.root)
+    rows = collect_inventory(
+        args.root,
+        follow_symlinks=args.follow_symlinks,
+        exclude_matcher=build_exclude_matcher(args.exclude),
+    )
+
+    rows = _add_file_columns(rows, args)
 
     out_dir = ensure_dir(Path(args.out_dir))
     out_path = Path(args.out) if args.out else make_outpath("inventory", out_dir, args.label)
@@ -96,8 +118,9 @@ def cmd_search(args: argparse.Namespace) -> None:
         use_regex=args.regex,
         case_sensitive=args.case_sensitive,
         include_exts=tuple(args.include_exts),
-        exclude_globs=args.exclude,
+        exclude_matcher=build_exclude_matcher(args.exclude),
         follow_symlinks=args.follow_symlinks,
+        backend=args.backend,
         # max_file_size_bytes와 preview_len은 argparse에 추가되지 않았으므로 기본값 사용
     )
 
@@ -113,13 +136,10 @@ def cmd_timeline(args: argparse.Namespace) -> None:
     rows = collect_inventory(
         args.root,
         follow_symlinks=args.follow_symlinks,
-        exclude_globs=args.exclude,
+        exclude_matcher=build_exclude_matcher(args.exclude),
     )
 
-    if args.with_hash:
-        rows = add_hashes_to_rows(rows, algorithms=tuple(args.hash_algorithms), chunk_size=args.hash_block_size)
-    if args.with_signature:
-        rows = add_signature_to_rows(rows, prefer_magic=not args.sig_no_magic)
+    rows = _add_file_columns(rows, args)
 
     tl_rows = build_timeline_rows(
         rows,
@@ -142,29 +162,30 @@ def cmd_validate(args: argparse.Namespace) -> None:
     rows = collect_inventory(
         args.root,
         follow_symlinks=args.follow_symlinks,
-        exclude_globs=args.exclude,
+        exclude_matcher=build_exclude_matcher(args.exclude),
     )
 
-    if args.with_hash:
-        rows = add_hashes_to_rows(rows, algorithms=tuple(args.hash_algorithms), chunk_size=args.hash_block_size)
-    if args.with_signature:
-        rows = add_signature_to_rows(rows, prefer_magic=not args.sig_no_magic)
-
-    issues = []
-    issues += validate_inventory_rows(rows) 
-
-    if getattr(args, 'verify_hash', False):
-        issues += sample_verify_hashes(
-            rows,
-            algorithms=tuple(args.hash_algorithms),
-            chunk_size=args.hash_block_size,
-        )
+    rows = _add_file_columns(rows, args)
 
+    # 이슈는 제너레이터로 이어 붙여 CSV에 바로 기록 (리스트로 모으지 않음), 요약은 기록하면서 집계
+    # 해시 샘플 재검증(파일 읽기)은 백그라운드 스레드에서 먼저 시작해, 행 검증/CSV 기록과 겹쳐 진행
+    # (CSV에는 기존과 같이 행 검증 이슈 → 재검증 이슈 순으로 기록)
     out_dir = ensure_dir(Path(args.out_dir))
     out_issues = Path(args.out_issues) if args.out_issues else make_outpath("validate", out_dir, args.label)
-    write_issues_csv(issues, out_issues)
-    summary = summarize_issues(issues)
-    print(f"[OK] issues: {len(issues)} -> {out_issues}")
+
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        issues: Iterable[Issue] = validate_inventory_rows(rows)
+        if getattr(args, 'verify_hash', False):
+            verify_future = ex.submit(collect, sample_verify_hashes(
+                rows,
+                algorithms=tuple(args.hash_algorithms),
+                chunk_size=args.hash_block_size,
+                cache_path=args.verify_cache or None,
+            ))
+            issues = chain(issues, _future_items(verify_future))
+        summary = write_issues_csv(issues, out_issues)
+    n_issues = sum(summary.get(sev, 0) for sev in (SEV_ERROR, SEV_WARN, SEV_INFO))
+    print(f"[OK] issues: {n_issues} -> {out_issues}")
     print("[SUMMARY]", summary)
 
     if getattr(args, 'out_inventory', None):
@@ -172,6 +193,11 @@ def cmd_validate(args: argparse.Namespace) -> None:
         _write_csv_dynamic(rows, inv_out)
 
 
+def _future_items(future: Future[List[Issue]]) -> Iterator[Issue]:
+    # 앞선 이슈를 다 기록한 뒤에야 결과를 기다림 (예외도 이 시점에 전달)
+    yield from future.result()
+
+
 # argparse 설정
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="ForensicFileAnalyzer", description="ForensicFileAnalyzer CLI")
@@ -185,7 +211,9 @@ def build_parser() -> argparse.ArgumentParser:
         sp.add_argument("--follow-symlinks", action="store_true", help="심볼릭 링크를 따라감")
         sp.add_argument("--with-hash", action="store_true", help="MD5/SHA-256 해시 열 추가")
         sp.add_argument("--hash-algorithms", nargs="*", default=["md5", "sha256"])
-        sp.add_argument("--hash-block-size", type=int, default=1024*1024)
+        sp.add_argument("--hash-block-size", type=int, default=4*1024*1024)
+        sp.add_argument("--hash-workers", type=int, default=None, help="해시 병렬 작업 수 (기본: 스레드 min(32, CPU 코어 수+4), 프로세스 CPU 코어 수)")
+        sp.add_argument("--hash-processes", action="store_true", help="해시 계산에 프로세스 풀 사용")
         sp.add_argument("--with-signature", action="store_true", help="파일 시그니처 판정 열 추가")
         sp.add_argument("--sig-no-magic", action="store_true", help="libmagic 미사용")
 
@@ -203,6 +231,7 @@ def build_parser() -> argparse.ArgumentParser:
     sea.add_argument("--regex", action="store_true", help="키워드를 정규식으로 처리")
     sea.add_argument("--case-sensitive", action="store_true", help="대소문자 구분")
     sea.add_argument("--include-exts", nargs="*", default=["txt", "log", "csv", "json", "xml", "md"])
+    sea.add_argument("--backend", choices=["re", "ahocorasick"], default="re", help="다중 키워드 검색 방식")
     sea.set_defaults(func=cmd_search)
 
     # timeline 
@@ -218,6 +247,7 @@ def build_parser() -> argparse.ArgumentParser:
     add_common_opts(val)
     val.add_argument("--out-issues", default="", help="검증 이슈 CSV 파일 경로")
     val.add_argument("--verify-hash", action="store_true", help="해시 샘플 재검증")
+    val.add_argument("--verify-cache", default="", help="해시 재검증 캐시(JSON) 경로. 크기/mtime이 같은 파일은 다시 읽지 않음")
     val.add_argument("--out-inventory", help="검증에 사용된 원본 인벤토리도 저장")
     val.set_defaults(func=cmd_validate)
 
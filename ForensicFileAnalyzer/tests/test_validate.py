@@ -0,0 +1,44 @@
+# tests/test_validate.py
+import hashlib
+import os
+import tempfile
+import unittest
+
+from forensic_analyzer.validate import CODE_HASH_BAD_HEX, CODE_HASH_VERIFY_FAIL, sample_verify_hashes
+
+
+class SampleVerifyHashesTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"forensic sample\n" * 100)
+        with open(self.path, "rb") as f:
+            self.digest = hashlib.sha256(f.read()).hexdigest()
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _codes(self, recorded):
+        rows = [{"path": self.path, "sha256": recorded}]
+        return [i.code for i in sample_verify_hashes(rows, algorithms=("sha256",))]
+
+    def test_matching_digest_any_case(self):
+        self.assertEqual(self._codes(self.digest), [])
+        self.assertEqual(self._codes(self.digest.upper()), [])
+
+    def test_digest_with_spaces_is_bad_hex(self):
+        # bytes.fromhex는 공백을 건너뛰지만 기록값 형식 오류로 잡아야 함
+        spaced = " ".join(self.digest[i:i + 2] for i in range(0, len(self.digest), 2))
+        self.assertEqual(self._codes(spaced), [CODE_HASH_BAD_HEX])
+
+    def test_wrong_length_or_non_hex_is_bad_hex(self):
+        self.assertEqual(self._codes(self.digest[:-2]), [CODE_HASH_BAD_HEX])
+        self.assertEqual(self._codes("z" + self.digest[1:]), [CODE_HASH_BAD_HEX])
+
+    def test_different_digest_is_mismatch(self):
+        other = ("0" if self.digest[0] != "0" else "1") + self.digest[1:]
+        self.assertEqual(self._codes(other), [CODE_HASH_VERIFY_FAIL])
+
+
+if __name__ == "__main__":
+    unittest.main()